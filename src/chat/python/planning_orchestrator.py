@@ -35,23 +35,40 @@ class PlanningOrchestrator:
     Wraps OrchestratorAgent for actual tool execution.
     """
 
-    def __init__(self, tool_registry, orchestrator_agent: OrchestratorAgent):
+    def __init__(
+        self,
+        tool_registry,
+        orchestrator_agent: OrchestratorAgent,
+        state_discovery: Optional[StateDiscovery] = None,
+        intent_planner: Optional[IntentPlanner] = None,
+        state_preparation: Optional[StatePreparationOrchestrator] = None
+    ):
         """
         Initialize planning orchestrator.
 
         Args:
             tool_registry: ToolRegistry instance
             orchestrator_agent: OrchestratorAgent instance for execution
+            state_discovery: StateDiscovery to use (optional, built from tool_registry)
+            intent_planner: IntentPlanner to use (optional, built from tool_registry)
+            state_preparation: StatePreparationOrchestrator to use (optional,
+                built from tool_registry)
         """
         self.tool_registry = tool_registry
         self.orchestrator_agent = orchestrator_agent
 
-        # Initialize phases
-        self.state_discovery = StateDiscovery(tool_registry)
-        self.intent_planner = IntentPlanner(tool_registry)
+        # Initialize phases, keeping any that were passed in
+        if state_discovery is None:
+            state_discovery = StateDiscovery(tool_registry)
+        if intent_planner is None:
+            intent_planner = IntentPlanner(tool_registry)
+        if state_preparation is None:
+            state_preparation = StatePreparationOrchestrator(tool_registry)
+        self.state_discovery = state_discovery
+        self.intent_planner = intent_planner
         self.prerequisite_resolver = PrerequisiteResolver(tool_registry)
         self.pre_execution_validator = PreExecutionValidator(tool_registry)
-        self.state_preparation = StatePreparationOrchestrator(tool_registry)
+        self.state_preparation = state_preparation
 
     def process_request(self, user_message: str) -> Dict[str, Any]:
         """
@@ -4,8 +4,10 @@ Planning State Management
 Tracks the state machine and execution plan for multi-step operations.
 """
 
+from collections import deque
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Deque, Dict, Any, List, Optional, Tuple
 import time
 
 
@@ -21,30 +23,80 @@ class PlanningPhase(Enum):
     COMPLETE = "complete"
 
 
+# Valid (from, to) phase transitions, flattened once at import so that
+# transition_to() is a single set membership check.
+_VALID_TRANSITIONS = frozenset(
+    (source, target)
+    for source, targets in {
+        PlanningPhase.INITIAL: [PlanningPhase.STATE_DISCOVERY, PlanningPhase.ERROR],
+        PlanningPhase.STATE_DISCOVERY: [PlanningPhase.PLANNING, PlanningPhase.ERROR],
+        PlanningPhase.PLANNING: [
+            PlanningPhase.STATE_DISCOVERY,  # Loop back if more state needed
+            PlanningPhase.PREREQUISITE_RESOLUTION,  # Legacy path
+            PlanningPhase.STATE_PREPARATION,  # New path
+            PlanningPhase.ERROR
+        ],
+        PlanningPhase.PREREQUISITE_RESOLUTION: [
+            PlanningPhase.EXECUTION,
+            PlanningPhase.ERROR
+        ],
+        PlanningPhase.STATE_PREPARATION: [
+            PlanningPhase.EXECUTION,
+            PlanningPhase.ERROR
+        ],
+        PlanningPhase.EXECUTION: [PlanningPhase.COMPLETE, PlanningPhase.ERROR],
+        PlanningPhase.ERROR: [PlanningPhase.INITIAL],  # Can restart from error
+        PlanningPhase.COMPLETE: []  # Terminal state
+    }.items()
+    for target in targets
+)
+
+
+def _validate_error(state: "PlanningState") -> Tuple[bool, Optional[str]]:
+    if not state.error_message:
+        return False, "Error state but no error message"
+    return True, None
+
+
+def _validate_execution(state: "PlanningState") -> Tuple[bool, Optional[str]]:
+    if not state.execution_plan:
+        return False, "Execution phase but no execution plan"
+    return True, None
+
+
+def _validate_prerequisite_resolution(state: "PlanningState") -> Tuple[bool, Optional[str]]:
+    if not state.execution_plan:
+        return False, "Prerequisite resolution but no execution plan"
+    return True, None
+
+
+# Per-phase validation checks used by PlanningState.validate(). Phases not
+# listed here are always valid: PLANNING and STATE_DISCOVERY are valid even
+# without a plan or state, since that work is still in progress.
+_PHASE_VALIDATORS = {
+    PlanningPhase.ERROR: _validate_error,
+    PlanningPhase.EXECUTION: _validate_execution,
+    PlanningPhase.PREREQUISITE_RESOLUTION: _validate_prerequisite_resolution,
+}
+
+
+@dataclass(eq=False)
 class PlanningState:
     """
     Manages state for the planning layer.
     Tracks user request, discovered state, execution plan, and results.
     """
-
-    def __init__(self, user_message: str):
-        """
-        Initialize planning state.
-
-        Args:
-            user_message: Original user request
-        """
-        self.user_message = user_message
-        self.discovered_state: Dict[str, Any] = {}
-        self.execution_plan: List[Dict[str, Any]] = []
-        self.prerequisites_resolved: bool = False
-        self.execution_results: List[Dict[str, Any]] = []
-        self.current_phase: PlanningPhase = PlanningPhase.INITIAL
-        self.error_message: Optional[str] = None
-        
-        # State synchronization tracking
-        self.state_discovery_timestamp: Optional[float] = None
-        self.state_staleness_threshold: float = 5.0  # seconds - state considered stale after 5s
+    user_message: str  # Original user request
+    discovered_state: Dict[str, Any] = field(default_factory=dict)
+    execution_plan: List[Dict[str, Any]] = field(default_factory=list)
+    prerequisites_resolved: bool = False
+    execution_results: Deque[Dict[str, Any]] = field(default_factory=deque)
+    current_phase: PlanningPhase = PlanningPhase.INITIAL
+    error_message: Optional[str] = None
+
+    # State synchronization tracking
+    state_discovery_timestamp: Optional[float] = None
+    state_staleness_threshold: float = 5.0  # seconds - state considered stale after 5s
 
     def transition_to(self, phase: PlanningPhase) -> bool:
         """
@@ -56,30 +108,7 @@ class PlanningState:
         Returns:
             True if transition is valid, False otherwise
         """
-        # Define valid transitions
-        valid_transitions = {
-            PlanningPhase.INITIAL: [PlanningPhase.STATE_DISCOVERY, PlanningPhase.ERROR],
-            PlanningPhase.STATE_DISCOVERY: [PlanningPhase.PLANNING, PlanningPhase.ERROR],
-            PlanningPhase.PLANNING: [
-                PlanningPhase.STATE_DISCOVERY,  # Loop back if more state needed
-                PlanningPhase.PREREQUISITE_RESOLUTION,  # Legacy path
-                PlanningPhase.STATE_PREPARATION,  # New path
-                PlanningPhase.ERROR
-            ],
-            PlanningPhase.PREREQUISITE_RESOLUTION: [
-                PlanningPhase.EXECUTION,
-                PlanningPhase.ERROR
-            ],
-            PlanningPhase.STATE_PREPARATION: [
-                PlanningPhase.EXECUTION,
-                PlanningPhase.ERROR
-            ],
-            PlanningPhase.EXECUTION: [PlanningPhase.COMPLETE, PlanningPhase.ERROR],
-            PlanningPhase.ERROR: [PlanningPhase.INITIAL],  # Can restart from error
-            PlanningPhase.COMPLETE: []  # Terminal state
-        }
-
-        if phase in valid_transitions.get(self.current_phase, []):
+        if (self.current_phase, phase) in _VALID_TRANSITIONS:
             self.current_phase = phase
             return True
         else:
@@ -160,30 +189,11 @@ class PlanningState:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if self.current_phase == PlanningPhase.ERROR:
-            if not self.error_message:
-                return False, "Error state but no error message"
+        validator = _PHASE_VALIDATORS.get(self.current_phase)
+        if validator is None:
+            # Remaining phases are valid without further checks
             return True, None
-
-        if self.current_phase == PlanningPhase.EXECUTION:
-            if not self.execution_plan:
-                return False, "Execution phase but no execution plan"
-            return True, None
-
-        if self.current_phase == PlanningPhase.PREREQUISITE_RESOLUTION:
-            if not self.execution_plan:
-                return False, "Prerequisite resolution but no execution plan"
-            return True, None
-
-        if self.current_phase == PlanningPhase.PLANNING:
-            # Planning phase is valid even without plan (planning in progress)
-            return True, None
-
-        if self.current_phase == PlanningPhase.STATE_DISCOVERY:
-            # State discovery is valid even without state (discovery in progress)
-            return True, None
-
-        return True, None
+        return validator(self)
 
     def is_state_stale(self) -> bool:
         """
@@ -256,7 +266,7 @@ class PlanningState:
             "discovered_state": self.discovered_state,
             "execution_plan": self.execution_plan,
             "prerequisites_resolved": self.prerequisites_resolved,
-            "execution_results": self.execution_results,
+            "execution_results": list(self.execution_results),
             "current_phase": self.current_phase.value,
             "error_message": self.error_message,
             "state_discovery_timestamp": self.state_discovery_timestamp
@@ -14,10 +14,14 @@ The planning_orchestrator.py now uses StatePreparationOrchestrator as the primar
 mechanism, falling back to this module only when state prep fails.
 """
 
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import AbstractSet, Dict, Any, List, Optional, Set, Tuple
 from tool_schemas import TOOL_PREREQUISITES
 
 
+# Shared check_prerequisites() result for tools without prerequisites
+_NO_MISSING_PREREQUISITES: Tuple[bool, AbstractSet[str]] = (True, frozenset())
+
+
 class PrerequisiteResolver:
     """
     Resolves missing prerequisites by adding prerequisite tools to execution plan.
@@ -31,6 +35,16 @@ class PrerequisiteResolver:
         "cursor_position": None,  # Can't be set, only queried
         "project_open": None,  # Can't be set, only checked
     }
+
+    # Order in which prerequisites are checked and resolved. check_prerequisites
+    # returns an unordered set, so resolution walks this to keep plans stable.
+    PREREQUISITE_ORDER = (
+        "project_open",
+        "time_selection",
+        "selected_clips",
+        "selected_tracks",
+        "cursor_position",
+    )
     
     # Tools that respect track selection (only operate on selected tracks)
     # These should check for selected_tracks but not require it (soft prerequisite)
@@ -53,6 +67,17 @@ class PrerequisiteResolver:
         "apply_truncate_silence",
     }
 
+    # Simple dependency tracking for order_by_dependencies:
+    # tools that set state should come before tools that use it
+    STATE_SETTER_TOOLS = {
+        "set_time_selection",
+        "set_selection_start_time",
+        "set_selection_end_time",
+        "select_all",
+        "select_all_tracks",
+        "seek",  # Sets cursor position
+    }
+
     def __init__(self, tool_registry):
         """
         Initialize prerequisite resolver.
@@ -66,7 +91,7 @@ class PrerequisiteResolver:
         self,
         tool_name: str,
         current_state: Dict[str, Any]
-    ) -> Tuple[bool, List[str]]:
+    ) -> Tuple[bool, AbstractSet[str]]:
         """
         Check if prerequisites for a tool are met.
 
@@ -77,23 +102,23 @@ class PrerequisiteResolver:
         Returns:
             Tuple of (all_met, missing_prerequisites)
         """
-        if tool_name not in TOOL_PREREQUISITES:
+        prerequisites = TOOL_PREREQUISITES.get(tool_name)
+        if prerequisites is None:
             # No prerequisites defined, assume OK
-            return True, []
+            return _NO_MISSING_PREREQUISITES
 
-        prerequisites = TOOL_PREREQUISITES[tool_name]
-        missing = []
+        missing: Set[str] = set()
 
         # Check project_open (always required if True)
         if prerequisites.get("project_open") is True:
             if not current_state.get("project_open", False):
-                missing.append("project_open")
+                missing.add("project_open")
 
         # Check time_selection
         time_selection_req = prerequisites.get("time_selection")
         if time_selection_req is True:  # Required
             if not current_state.get("has_time_selection", False):
-                missing.append("time_selection")
+                missing.add("time_selection")
         # Optional (False) or None - no check needed
 
         # Check selected_clips
@@ -101,14 +126,14 @@ class PrerequisiteResolver:
         if selected_clips_req is True:  # Required
             selected_clips = current_state.get("selected_clips", [])
             if not selected_clips:
-                missing.append("selected_clips")
+                missing.add("selected_clips")
 
         # Check selected_tracks
         selected_tracks_req = prerequisites.get("selected_tracks")
         if selected_tracks_req is True:  # Required
             selected_tracks = current_state.get("selected_tracks", [])
             if not selected_tracks:
-                missing.append("selected_tracks")
+                missing.add("selected_tracks")
         
         # Check for tools that respect track selection (soft prerequisite)
         # These tools operate on selected tracks, so we should ensure tracks are selected
@@ -123,9 +148,9 @@ class PrerequisiteResolver:
         if cursor_position_req is True:  # Required
             cursor = current_state.get("cursor_position")
             if cursor is None:
-                missing.append("cursor_position")
+                missing.add("cursor_position")
 
-        all_met = len(missing) == 0
+        all_met = not missing
         return all_met, missing
 
     def resolve_missing_prerequisites(
@@ -171,9 +196,9 @@ class PrerequisiteResolver:
 
             if not all_met:
                 # Try to resolve each missing prerequisite
-                for prereq in missing:
-                    if prereq in added_prerequisites:
-                        # Already added this prerequisite earlier in the plan
+                for prereq in self.PREREQUISITE_ORDER:
+                    if prereq not in missing or prereq in added_prerequisites:
+                        # Not missing, or already added earlier in the plan
                         continue
 
                     prerequisite_tool = self._get_prerequisite_tool(prereq, current_state)
@@ -277,29 +302,18 @@ class PrerequisiteResolver:
         Returns:
             Tuple of (ordered_plan, errors)
         """
-        # Simple dependency tracking
-        # Tools that set state should come before tools that use it
-        state_setters = {
-            "set_time_selection",
-            "set_selection_start_time",
-            "set_selection_end_time",
-            "select_all",
-            "select_all_tracks",
-            "seek"  # Sets cursor position
-        }
-
         ordered_plan = []
-        remaining = execution_plan.copy()
+        remaining = []
         errors = []
 
-        # First pass: add all state setters
+        # Single stable pass: state setters first, then remaining tools,
+        # each group keeping its original relative order
         for tool_call in execution_plan:
-            tool_name = tool_call.get("tool_name")
-            if tool_name in state_setters:
+            if tool_call.get("tool_name") in self.STATE_SETTER_TOOLS:
                 ordered_plan.append(tool_call)
-                remaining.remove(tool_call)
+            else:
+                remaining.append(tool_call)
 
-        # Second pass: add remaining tools
         ordered_plan.extend(remaining)
 
         # Check for circular dependencies (simple check)
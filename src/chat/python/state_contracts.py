@@ -14,9 +14,16 @@ The State Preparation system uses these contracts to determine what
 state must be set before a tool can execute.
 """
 
-from typing import Dict, Any, List, Optional
+import sys
+from typing import Dict, Any, List, Mapping, Optional
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+
+# Keyword arguments for @dataclass(**DATACLASS_SLOTS): slotted dataclasses
+# (no per-instance __dict__) on Python 3.10+, plain dataclasses before that.
+# Shared by the state modules, which still support Python 3.7.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class StateKey(Enum):
@@ -32,7 +39,7 @@ class StateKey(Enum):
     PROJECT_OPEN = "project_open"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StateRequirement:
     """A single state requirement for a tool."""
     key: StateKey
@@ -41,7 +48,7 @@ class StateRequirement:
     description: str = ""
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ToolStateContract:
     """Complete state contract for a tool."""
     tool_name: str
@@ -53,7 +60,7 @@ class ToolStateContract:
 
 # Ground truth contracts derived from trackeditactionscontroller.cpp
 # Verified against actual C++ implementation
-TOOL_STATE_CONTRACTS: Dict[str, ToolStateContract] = {
+_TOOL_STATE_CONTRACTS: Dict[str, ToolStateContract] = {
 
     # === Clip Operations ===
 
@@ -595,6 +602,9 @@ TOOL_STATE_CONTRACTS: Dict[str, ToolStateContract] = {
     ),
 }
 
+# Read-only view so callers cannot modify the contracts at runtime
+TOOL_STATE_CONTRACTS: Mapping[str, ToolStateContract] = MappingProxyType(_TOOL_STATE_CONTRACTS)
+
 
 # Map from state key to the tool that can set it
 STATE_SETTERS: Dict[StateKey, str] = {
@@ -665,3 +675,44 @@ def is_state_setting_tool(tool_name: str) -> bool:
         "reset_selection"
     }
     return tool_name in state_setting_tools
+
+
+def validate_contracts() -> List[str]:
+    """
+    Check every contract's structure in a single pass.
+
+    Returns:
+        List of problems found (empty if all contracts are well-formed)
+    """
+    problems = []
+    for tool_name, contract in TOOL_STATE_CONTRACTS.items():
+        if not isinstance(contract, ToolStateContract):
+            problems.append(f"{tool_name} is not ToolStateContract")
+            continue
+        if contract.tool_name != tool_name:
+            problems.append(f"Mismatched tool_name for {tool_name}")
+        if not isinstance(contract.state_reads, list):
+            problems.append(f"{tool_name} state_reads is not list")
+        if not isinstance(contract.parameters, dict):
+            problems.append(f"{tool_name} parameters is not dict")
+        if not isinstance(contract.state_writes, list):
+            problems.append(f"{tool_name} state_writes is not list")
+        if not isinstance(contract.cpp_reference, str):
+            problems.append(f"{tool_name} cpp_reference is not str")
+
+        for req in contract.state_reads:
+            if not isinstance(req, StateRequirement):
+                problems.append(f"{tool_name} has non-StateRequirement")
+                continue
+            if not isinstance(req.key, StateKey):
+                problems.append(f"{tool_name} has invalid StateKey")
+            if not isinstance(req.required, bool):
+                problems.append(f"{tool_name} required is not bool")
+            if req.fallback_from is not None and not isinstance(req.fallback_from, StateKey):
+                problems.append(f"{tool_name} fallback_from invalid")
+
+        for state_key in contract.state_writes:
+            if not isinstance(state_key, StateKey):
+                problems.append(f"{tool_name} state_writes has invalid key")
+
+    return problems
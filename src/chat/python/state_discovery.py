@@ -24,6 +24,30 @@ class StateDiscovery:
         "actions": ["action_enabled"]  # For checking if actions are enabled
     }
 
+    # Message keywords that trigger each query category
+    SELECTION_KEYWORDS = ("selection", "select", "selected", "this", "trim", "cut", "delete", "copy")
+    CURSOR_KEYWORDS = ("cursor", "playhead", "position", "at", "here")
+    TRACK_KEYWORDS = ("track", "tracks", "audio track", "mono", "stereo")
+    CLIP_KEYWORDS = ("clip", "clips", "split", "join")
+    LABEL_KEYWORDS = ("label", "labels", "marker", "markers", "intro", "outro", "chapter")
+    RELATIVE_TIME_KEYWORDS = ("last", "end", "total", "duration", "length")
+
+    # Queries that require arguments (track_id / action_code), skipped during discovery
+    PARAMETERIZED_QUERIES = frozenset({"get_clips_on_track", "action_enabled"})
+
+    # Map query names to the state keys they populate
+    QUERY_STATE_KEYS = {
+        "has_time_selection": "has_time_selection",
+        "get_selection_start_time": "selection_start_time",
+        "get_selection_end_time": "selection_end_time",
+        "get_cursor_position": "cursor_position",
+        "get_total_project_time": "total_project_time",
+        "get_track_list": "track_list",
+        "get_selected_tracks": "selected_tracks",
+        "get_selected_clips": "selected_clips",
+        "get_all_labels": "all_labels"
+    }
+
     def __init__(self, tool_registry):
         """
         Initialize state discovery.
@@ -32,8 +56,6 @@ class StateDiscovery:
             tool_registry: ToolRegistry instance for executing state queries
         """
         self.tool_registry = tool_registry
-        self._state_cache: Dict[str, Any] = {}
-        self._cache_valid = False
 
     def determine_required_queries(
         self,
@@ -57,33 +79,27 @@ class StateDiscovery:
         required_queries.update(self.STATE_QUERY_TOOLS["project"])
 
         # Check for selection-related keywords
-        selection_keywords = ["selection", "select", "selected", "this", "trim", "cut", "delete", "copy"]
-        if any(keyword in user_message_lower for keyword in selection_keywords):
+        if any(keyword in user_message_lower for keyword in self.SELECTION_KEYWORDS):
             required_queries.update(self.STATE_QUERY_TOOLS["selection"])
 
         # Check for cursor-related keywords
-        cursor_keywords = ["cursor", "playhead", "position", "at", "here"]
-        if any(keyword in user_message_lower for keyword in cursor_keywords):
+        if any(keyword in user_message_lower for keyword in self.CURSOR_KEYWORDS):
             required_queries.update(self.STATE_QUERY_TOOLS["cursor"])
 
         # Check for track-related keywords
-        track_keywords = ["track", "tracks", "audio track", "mono", "stereo"]
-        if any(keyword in user_message_lower for keyword in track_keywords):
+        if any(keyword in user_message_lower for keyword in self.TRACK_KEYWORDS):
             required_queries.update(self.STATE_QUERY_TOOLS["tracks"])
 
         # Check for clip-related keywords
-        clip_keywords = ["clip", "clips", "split", "join"]
-        if any(keyword in user_message_lower for keyword in clip_keywords):
+        if any(keyword in user_message_lower for keyword in self.CLIP_KEYWORDS):
             required_queries.update(self.STATE_QUERY_TOOLS["clips"])
 
         # Check for label-related keywords
-        label_keywords = ["label", "labels", "marker", "markers", "intro", "outro", "chapter"]
-        if any(keyword in user_message_lower for keyword in label_keywords):
+        if any(keyword in user_message_lower for keyword in self.LABEL_KEYWORDS):
             required_queries.update(self.STATE_QUERY_TOOLS["labels"])
 
         # Check for relative time references that need total time
-        relative_time_keywords = ["last", "end", "total", "duration", "length"]
-        if any(keyword in user_message_lower for keyword in relative_time_keywords):
+        if any(keyword in user_message_lower for keyword in self.RELATIVE_TIME_KEYWORDS):
             required_queries.update(self.STATE_QUERY_TOOLS["project"])
 
         # If no specific keywords found, query essential state
@@ -96,19 +112,7 @@ class StateDiscovery:
         if current_state:
             filtered_queries = []
             for query in required_queries:
-                # Map query names to state keys
-                state_key_map = {
-                    "has_time_selection": "has_time_selection",
-                    "get_selection_start_time": "selection_start_time",
-                    "get_selection_end_time": "selection_end_time",
-                    "get_cursor_position": "cursor_position",
-                    "get_total_project_time": "total_project_time",
-                    "get_track_list": "track_list",
-                    "get_selected_tracks": "selected_tracks",
-                    "get_selected_clips": "selected_clips",
-                    "get_all_labels": "all_labels"
-                }
-                state_key = state_key_map.get(query)
+                state_key = self.QUERY_STATE_KEYS.get(query)
                 if state_key and state_key not in current_state:
                     filtered_queries.append(query)
             required_queries = set(filtered_queries)
@@ -131,16 +135,13 @@ class StateDiscovery:
         results = {}
 
         for query_name in queries:
+            # Queries that need arguments (track_id / action_code) are skipped for now
+            if query_name in self.PARAMETERIZED_QUERIES:
+                continue
+
             try:
-                # Execute query (most state queries take no arguments)
-                if query_name == "get_clips_on_track":
-                    # This one requires track_id, skip for now
-                    continue
-                elif query_name == "action_enabled":
-                    # This one requires action_code, skip for now
-                    continue
-                else:
-                    result = self.tool_registry.execute_by_name(query_name, {})
+                # Most state queries take no arguments
+                result = self.tool_registry.execute_by_name(query_name, {})
 
                 if result.get("success", False):
                     results[query_name] = result.get("value")
@@ -222,10 +223,6 @@ class StateDiscovery:
         Returns:
             Complete state snapshot
         """
-        # Check cache first
-        if self._cache_valid and current_state is None:
-            return self._state_cache.copy()
-
         # Determine required queries
         queries = self.determine_required_queries(user_message, current_state)
 
@@ -239,14 +236,4 @@ class StateDiscovery:
         if current_state:
             snapshot.update(current_state)
 
-        # Update cache
-        self._state_cache = snapshot.copy()
-        self._cache_valid = True
-
         return snapshot
-
-    def invalidate_cache(self):
-        """Invalidate the state cache (call after state-changing operations)."""
-        self._cache_valid = False
-        self._state_cache = {}
-
@@ -8,10 +8,11 @@ Compares current state against tool state contracts to identify:
 3. What values need to be inferred
 """
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, List, Optional, Sequence
+from dataclasses import dataclass, field
 
 from state_contracts import (
+    DATACLASS_SLOTS,
     get_contract,
     get_state_setting_tool,
     StateKey,
@@ -20,7 +21,7 @@ from state_contracts import (
 )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StateGap:
     """A single state gap that needs to be filled."""
     state_key: StateKey
@@ -31,13 +32,20 @@ class StateGap:
     fallback_key: Optional[StateKey] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class GapAnalysisResult:
     """Result of analyzing state gaps for a tool."""
     tool_name: str
     can_execute: bool  # True if all required state exists
     gaps: List[StateGap]
     missing_parameters: List[str]  # Tool parameters not provided
+    gaps_by_key: Dict[StateKey, StateGap] = field(init=False, repr=False, compare=False)
+    gap_keys: FrozenSet[StateKey] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Index gaps by state key; reversed so the first gap for a key wins
+        self.gaps_by_key = {gap.state_key: gap for gap in reversed(self.gaps)}
+        self.gap_keys = frozenset(self.gaps_by_key)
 
 
 class StateGapAnalyzer:
@@ -162,7 +170,7 @@ class StateGapAnalyzer:
 
     def get_gaps_for_state_keys(
         self,
-        required_keys: List[StateKey],
+        required_keys: Sequence[StateKey],
         current_state: Dict[str, Any]
     ) -> List[StateGap]:
         """
@@ -170,7 +178,7 @@ class StateGapAnalyzer:
         Useful for checking if specific state values are available.
 
         Args:
-            required_keys: List of state keys to check
+            required_keys: Sequence of state keys to check
             current_state: Current state snapshot
 
         Returns:
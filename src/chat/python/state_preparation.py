@@ -17,22 +17,29 @@ import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
-from state_contracts import get_contract, StateKey, get_state_setting_tool
+from state_contracts import DATACLASS_SLOTS, get_contract, StateKey, get_state_setting_tool
 from state_gap_analyzer import StateGapAnalyzer, GapAnalysisResult
 from value_inference import ValueInferenceEngine, InferenceResult
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PreparationStep:
     """A single state preparation step."""
     tool_name: str
     arguments: Dict[str, Any]
     purpose: str  # Human-readable description
 
+    def __post_init__(self):
+        # Validated once here so consumers can rely on non-empty strings
+        if not (isinstance(self.tool_name, str) and self.tool_name):
+            raise ValueError("PreparationStep.tool_name must be a non-empty string")
+        if not (isinstance(self.purpose, str) and self.purpose):
+            raise ValueError("PreparationStep.purpose must be a non-empty string")
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class PreparationResult:
     """Result of state preparation."""
     ready_to_execute: bool
@@ -43,6 +50,27 @@ class PreparationResult:
     needs_clarification: bool
     clarification_message: Optional[str]
 
+    def to_comparable(self) -> Dict[str, Any]:
+        """
+        Convert result to plain Python values for whole-result comparison.
+
+        Step purposes are display text and are left out.
+
+        Returns:
+            Result as dictionary
+        """
+        return {
+            "ready_to_execute": self.ready_to_execute,
+            "preparation_steps": [
+                (step.tool_name, step.arguments) for step in self.preparation_steps
+            ],
+            "operation_tool": self.operation_tool,
+            "operation_arguments": self.operation_arguments,
+            "error": self.error,
+            "needs_clarification": self.needs_clarification,
+            "clarification_message": self.clarification_message
+        }
+
 
 class StatePreparationOrchestrator:
     """
@@ -79,7 +107,25 @@ class StatePreparationOrchestrator:
         Returns:
             PreparationResult with preparation steps or error
         """
-        current_state = initial_state.copy()
+        return self._prepare_in_place(
+            tool_name,
+            tool_arguments,
+            user_message,
+            initial_state.copy()
+        )
+
+    def _prepare_in_place(
+        self,
+        tool_name: str,
+        tool_arguments: Dict[str, Any],
+        user_message: str,
+        current_state: Dict[str, Any]
+    ) -> PreparationResult:
+        """
+        Run the preparation loop, simulating preparation steps directly on
+        current_state. The caller owns current_state and must pass a copy if
+        its snapshot has to survive.
+        """
         preparation_steps = []
         iteration = 0
         tool_args = tool_arguments.copy()
@@ -302,11 +348,13 @@ class StatePreparationOrchestrator:
             tool_name = tool_call.get("tool_name", "")
             tool_args = tool_call.get("arguments", {})
 
-            result = self.prepare(
-                tool_name=tool_name,
-                tool_arguments=tool_args,
-                user_message=user_message,
-                initial_state=current_state
+            # Preparation steps are simulated on current_state as they are
+            # generated, so one copy serves the whole sequence
+            result = self._prepare_in_place(
+                tool_name,
+                tool_args,
+                user_message,
+                current_state
             )
             results.append(result)
 
@@ -314,10 +362,6 @@ class StatePreparationOrchestrator:
                 # Stop on first error or clarification needed
                 break
 
-            # Simulate state changes from preparation steps
-            for step in result.preparation_steps:
-                self._simulate_state_change(step, current_state, InferenceResult({}, [], False, None))
-
             # Simulate state changes from the operation tool itself
             self.gap_analyzer._simulate_state_change(
                 result.operation_tool,
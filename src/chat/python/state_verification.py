@@ -10,12 +10,12 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
-from state_contracts import get_contract, StateKey
+from state_contracts import DATACLASS_SLOTS, get_contract, StateKey
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class VerificationResult:
     """Result of state verification."""
     success: bool
@@ -2,4 +2,12 @@
 Unit tests for chat system Python components
 """
 
+import os
+import sys
 
+# Make the modules under test importable when the tests are loaded as a
+# package. Each test module keeps its own guarded insert as well, so it still
+# runs as a script or under discovery from inside tests/.
+_PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PARENT_DIR not in sys.path:
+    sys.path.insert(0, _PARENT_DIR)
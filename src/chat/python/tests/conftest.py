@@ -0,0 +1,12 @@
+"""
+pytest hooks for the chat test suite (path setup lives in __init__.py)
+"""
+
+import gc
+
+
+def pytest_collection_finish(session):
+    """Freeze objects created during collection, as tests/run_all.py does."""
+    # Imported modules, shared fixtures and constants live for the whole
+    # session; the garbage collector no longer needs to scan them
+    gc.freeze()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Run the whole chat test suite in a single interpreter.
+
+Discovers every test_*.py module in this directory and runs them as one
+combined suite, so interpreter startup and the imports of the modules under
+test are paid once instead of once per test module.
+
+Usage:
+    python tests/run_all.py [-v]
+"""
+
+import gc
+import os
+import sys
+import unittest
+
+
+def main() -> int:
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
+    suite = unittest.TestLoader().discover(
+        start_dir=tests_dir,
+        top_level_dir=os.path.dirname(tests_dir)
+    )
+    # Modules, shared fixtures and constants live for the whole run; move
+    # them out of the collector's reach so collections only scan test garbage
+    gc.freeze()
+    verbosity = 2 if "-v" in sys.argv[1:] else 1
+    result = unittest.TextTestRunner(verbosity=verbosity).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
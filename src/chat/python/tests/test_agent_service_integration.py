@@ -16,8 +16,10 @@ import os
 import json
 from unittest.mock import Mock, MagicMock, patch, call
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from agent_service import AgentService
 from planning_orchestrator import PlanningOrchestrator
@@ -171,4 +173,3 @@ class TestAgentServiceIntegration(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
-
@@ -14,13 +14,15 @@ NOTE: As of the State Preparation architecture update (2025-12-06),
 prerequisite_resolver has been replaced by state_preparation.
 """
 
-import unittest
-import sys
 import os
+import sys
+import unittest
 from unittest.mock import Mock, MagicMock, patch
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from planning_orchestrator import PlanningOrchestrator
 from planning_state import PlanningPhase
@@ -12,12 +12,14 @@ Tests location parsing including:
 - Time format parsing
 """
 
-import unittest
-import sys
 import os
+import sys
+import unittest
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from location_parser import LocationParser
 
@@ -230,4 +232,3 @@ class TestFindLabelByName(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
-
@@ -18,8 +18,10 @@ import os
 import json
 from unittest.mock import Mock, MagicMock, patch
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from planning_orchestrator import PlanningOrchestrator
 from planning_state import PlanningPhase
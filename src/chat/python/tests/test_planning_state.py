@@ -10,12 +10,15 @@ Tests the planning state management including:
 - State persistence across phases
 """
 
-import unittest
-import sys
+import copy
 import os
+import sys
+import unittest
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from planning_state import PlanningState, PlanningPhase
 
@@ -30,7 +33,7 @@ class TestPlanningStateInitialization(unittest.TestCase):
         self.assertEqual(state.discovered_state, {})
         self.assertEqual(state.execution_plan, [])
         self.assertFalse(state.prerequisites_resolved)
-        self.assertEqual(state.execution_results, [])
+        self.assertEqual(list(state.execution_results), [])
         self.assertEqual(state.current_phase, PlanningPhase.INITIAL)
         self.assertIsNone(state.error_message)
 
@@ -151,51 +154,49 @@ class TestPlanningStateValidation(unittest.TestCase):
         self.assertTrue(is_valid)
         self.assertIsNone(error)
 
-    def test_validate_prerequisite_resolution_without_plan(self):
-        """Test validation of PREREQUISITE_RESOLUTION without execution plan"""
+    def test_validate_prerequisite_resolution(self):
+        """Test validation of PREREQUISITE_RESOLUTION with and without execution plan"""
         state = PlanningState("test")
         state.transition_to(PlanningPhase.STATE_DISCOVERY)
         state.transition_to(PlanningPhase.PLANNING)
-        state.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
-        is_valid, error = state.validate()
-        # Should be invalid without execution plan
-        self.assertFalse(is_valid)
-        self.assertIsNotNone(error)
 
-    def test_validate_prerequisite_resolution_with_plan(self):
-        """Test validation of PREREQUISITE_RESOLUTION with execution plan"""
+        with self.subTest("without plan"):
+            without_plan = copy.copy(state)
+            without_plan.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
+            is_valid, error = without_plan.validate()
+            # Should be invalid without execution plan
+            self.assertFalse(is_valid)
+            self.assertIsNotNone(error)
+
+        with self.subTest("with plan"):
+            state.set_execution_plan([{"tool_name": "test_tool", "arguments": {}}])
+            state.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
+            is_valid, error = state.validate()
+            self.assertTrue(is_valid)
+            self.assertIsNone(error)
+
+    def test_validate_execution(self):
+        """Test validation of EXECUTION phase with and without execution plan"""
         state = PlanningState("test")
         state.transition_to(PlanningPhase.STATE_DISCOVERY)
         state.transition_to(PlanningPhase.PLANNING)
-        state.set_execution_plan([{"tool_name": "test_tool", "arguments": {}}])
-        state.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
-        is_valid, error = state.validate()
-        self.assertTrue(is_valid)
-        self.assertIsNone(error)
 
-    def test_validate_execution_without_plan(self):
-        """Test validation of EXECUTION phase without execution plan"""
-        state = PlanningState("test")
-        state.transition_to(PlanningPhase.STATE_DISCOVERY)
-        state.transition_to(PlanningPhase.PLANNING)
-        state.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
-        state.transition_to(PlanningPhase.EXECUTION)
-        is_valid, error = state.validate()
-        # Should be invalid without execution plan
-        self.assertFalse(is_valid)
-        self.assertIsNotNone(error)
-
-    def test_validate_execution_with_plan(self):
-        """Test validation of EXECUTION phase with execution plan"""
-        state = PlanningState("test")
-        state.transition_to(PlanningPhase.STATE_DISCOVERY)
-        state.transition_to(PlanningPhase.PLANNING)
-        state.set_execution_plan([{"tool_name": "test_tool", "arguments": {}}])
-        state.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
-        state.transition_to(PlanningPhase.EXECUTION)
-        is_valid, error = state.validate()
-        self.assertTrue(is_valid)
-        self.assertIsNone(error)
+        with self.subTest("without plan"):
+            without_plan = copy.copy(state)
+            without_plan.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
+            without_plan.transition_to(PlanningPhase.EXECUTION)
+            is_valid, error = without_plan.validate()
+            # Should be invalid without execution plan
+            self.assertFalse(is_valid)
+            self.assertIsNotNone(error)
+
+        with self.subTest("with plan"):
+            state.set_execution_plan([{"tool_name": "test_tool", "arguments": {}}])
+            state.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
+            state.transition_to(PlanningPhase.EXECUTION)
+            is_valid, error = state.validate()
+            self.assertTrue(is_valid)
+            self.assertIsNone(error)
 
     def test_validate_error_state(self):
         """Test validation of ERROR state"""
@@ -214,6 +215,20 @@ class TestPlanningStateValidation(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertIsNotNone(error)
 
+    def test_validate_reflects_direct_field_changes(self):
+        """Test validate sees plans assigned or appended without set_execution_plan"""
+        state = PlanningState("test")
+        state.transition_to(PlanningPhase.STATE_DISCOVERY)
+        state.transition_to(PlanningPhase.PLANNING)
+        state.transition_to(PlanningPhase.PREREQUISITE_RESOLUTION)
+        self.assertFalse(state.validate()[0])
+
+        state.execution_plan.append({"tool_name": "test_tool", "arguments": {}})
+        self.assertEqual(state.validate(), (True, None))
+
+        state.execution_plan = []
+        self.assertFalse(state.validate()[0])
+
 
 class TestPlanningStateDictionaryUpdates(unittest.TestCase):
     """Test PlanningState dictionary updates"""
@@ -316,10 +331,10 @@ class TestPlanningStatePersistence(unittest.TestCase):
         self.assertEqual(state_dict["discovered_state"], {"key": "value"})
         self.assertEqual(state_dict["execution_plan"], [{"tool_name": "tool1", "arguments": {}}])
         self.assertTrue(state_dict["prerequisites_resolved"])
+        self.assertEqual(state_dict["execution_results"], [])
         self.assertEqual(state_dict["current_phase"], "planning")
         self.assertIsNone(state_dict["error_message"])
 
 
 if __name__ == '__main__':
     unittest.main()
-
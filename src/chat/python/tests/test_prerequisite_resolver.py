@@ -9,76 +9,108 @@ Tests prerequisite resolution including:
 - Edge cases
 """
 
-import unittest
-import sys
 import os
-from unittest.mock import Mock
+import sys
+import unittest
+from types import MappingProxyType
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from prerequisite_resolver import PrerequisiteResolver
 from tool_schemas import TOOL_PREREQUISITES
 
 
+class _NullRegistry:
+    """Registry stand-in; PrerequisiteResolver never calls into the registry."""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        raise AttributeError(name)
+
+
+# Shared tool calls. The resolver never mutates the tool calls it is given,
+# so tests reuse these instead of rebuilding identical literals.
+_TRIM = {"tool_name": "trim_to_selection", "arguments": {}}
+_CUT = {"tool_name": "cut", "arguments": {}}
+_JOIN = {"tool_name": "join", "arguments": {}}
+_PLAY = {"tool_name": "play", "arguments": {}}
+_NORMALIZE = {"tool_name": "apply_normalize", "arguments": {}}
+_SELECT_ALL = {"tool_name": "select_all", "arguments": {}}
+_SET_TIME_SELECTION = {
+    "tool_name": "set_time_selection",
+    "arguments": {"start_time": 10.0, "end_time": 20.0}
+}
+
+# Shared read-only state snapshots. check_prerequisites() only reads the
+# state; resolve paths update it optimistically and get a dict() copy.
+_STATE_EMPTY = MappingProxyType({})
+_STATE_PROJECT_OPEN = MappingProxyType({"project_open": True})
+_STATE_NO_PROJECT = MappingProxyType({"project_open": False})
+_STATE_READY = MappingProxyType({
+    "project_open": True,
+    "has_time_selection": True,
+    "selected_clips": ("clip1",),
+    "selected_tracks": ("track1",),
+    "cursor_position": 10.0
+})
+_STATE_NO_TIME_SELECTION = MappingProxyType({
+    "project_open": True,
+    "has_time_selection": False
+})
+_STATE_SELECTION_NOT_SET = MappingProxyType({
+    "project_open": True,
+    "has_time_selection": False,
+    "selection_start_time": 10.0,
+    "selection_end_time": 20.0
+})
+
+
 class TestCheckPrerequisites(unittest.TestCase):
     """Test checking prerequisites"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.resolver = PrerequisiteResolver(self.tool_registry)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures (the resolver is stateless)"""
+        cls.tool_registry = _NullRegistry()
+        cls.resolver = PrerequisiteResolver(cls.tool_registry)
 
     def test_check_prerequisites_all_met(self):
         """Test checking prerequisites when all are met"""
-        current_state = {
-            "project_open": True,
-            "has_time_selection": True,
-            "selected_clips": ["clip1"],
-            "selected_tracks": ["track1"],
-            "cursor_position": 10.0
-        }
-        
-        all_met, missing = self.resolver.check_prerequisites("trim_to_selection", current_state)
+        all_met, missing = self.resolver.check_prerequisites("trim_to_selection", _STATE_READY)
         self.assertTrue(all_met)
         self.assertEqual(len(missing), 0)
 
     def test_check_prerequisites_missing_required(self):
         """Test checking prerequisites when required prerequisite is missing"""
-        current_state = {
-            "project_open": True,
-            "has_time_selection": False  # Missing required
-        }
-        
-        all_met, missing = self.resolver.check_prerequisites("trim_to_selection", current_state)
+        # time_selection is required for trim_to_selection
+        all_met, missing = self.resolver.check_prerequisites(
+            "trim_to_selection", _STATE_NO_TIME_SELECTION
+        )
         self.assertFalse(all_met)
         self.assertIn("time_selection", missing)
 
     def test_check_prerequisites_missing_project_open(self):
         """Test checking prerequisites when project is not open"""
-        current_state = {
-            "project_open": False
-        }
-        
-        all_met, missing = self.resolver.check_prerequisites("trim_to_selection", current_state)
+        all_met, missing = self.resolver.check_prerequisites(
+            "trim_to_selection", _STATE_NO_PROJECT
+        )
         self.assertFalse(all_met)
         self.assertIn("project_open", missing)
 
     def test_check_prerequisites_optional_prerequisite(self):
         """Test checking prerequisites with optional prerequisite"""
-        current_state = {
-            "project_open": True,
-            "has_time_selection": False  # Optional, so should pass
-        }
-        
-        all_met, missing = self.resolver.check_prerequisites("clear_selection", current_state)
+        all_met, missing = self.resolver.check_prerequisites(
+            "clear_selection", _STATE_NO_TIME_SELECTION
+        )
         # clear_selection has optional time_selection, so should pass
         self.assertTrue(all_met)
 
     def test_check_prerequisites_tool_not_in_prerequisites(self):
         """Test checking prerequisites for tool not in TOOL_PREREQUISITES"""
-        current_state = {}
-        all_met, missing = self.resolver.check_prerequisites("unknown_tool", current_state)
+        all_met, missing = self.resolver.check_prerequisites("unknown_tool", _STATE_EMPTY)
         # Should pass (no prerequisites defined)
         self.assertTrue(all_met)
         self.assertEqual(len(missing), 0)
@@ -87,22 +119,16 @@ class TestCheckPrerequisites(unittest.TestCase):
 class TestResolveMissingPrerequisites(unittest.TestCase):
     """Test resolving missing prerequisites"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.resolver = PrerequisiteResolver(self.tool_registry)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures (the resolver is stateless)"""
+        cls.tool_registry = _NullRegistry()
+        cls.resolver = PrerequisiteResolver(cls.tool_registry)
 
     def test_resolve_missing_prerequisites_adds_set_time_selection(self):
         """Test resolving missing time_selection prerequisite"""
-        execution_plan = [
-            {"tool_name": "trim_to_selection", "arguments": {}}
-        ]
-        current_state = {
-            "project_open": True,
-            "has_time_selection": False,
-            "selection_start_time": 10.0,
-            "selection_end_time": 20.0
-        }
+        execution_plan = [_TRIM]
+        current_state = dict(_STATE_SELECTION_NOT_SET)
         
         resolved_plan, errors = self.resolver.resolve_missing_prerequisites(
             execution_plan, current_state
@@ -115,9 +141,7 @@ class TestResolveMissingPrerequisites(unittest.TestCase):
 
     def test_resolve_missing_prerequisites_adds_select_all(self):
         """Test resolving missing selected_clips prerequisite"""
-        execution_plan = [
-            {"tool_name": "join", "arguments": {}}
-        ]
+        execution_plan = [_JOIN]
         current_state = {
             "project_open": True,
             "selected_clips": []  # Missing required
@@ -135,15 +159,10 @@ class TestResolveMissingPrerequisites(unittest.TestCase):
     def test_resolve_missing_prerequisites_no_duplicates(self):
         """Test resolving missing prerequisites doesn't duplicate"""
         execution_plan = [
-            {"tool_name": "trim_to_selection", "arguments": {}},
-            {"tool_name": "cut", "arguments": {}}  # Also needs time_selection
+            _TRIM,
+            _CUT  # Also needs time_selection
         ]
-        current_state = {
-            "project_open": True,
-            "has_time_selection": False,
-            "selection_start_time": 10.0,
-            "selection_end_time": 20.0
-        }
+        current_state = dict(_STATE_SELECTION_NOT_SET)
         
         resolved_plan, errors = self.resolver.resolve_missing_prerequisites(
             execution_plan, current_state
@@ -158,14 +177,9 @@ class TestResolveMissingPrerequisites(unittest.TestCase):
 
     def test_resolve_missing_prerequisites_cannot_resolve(self):
         """Test resolving missing prerequisites when can't resolve"""
-        execution_plan = [
-            {"tool_name": "trim_to_selection", "arguments": {}}
-        ]
-        current_state = {
-            "project_open": True,
-            "has_time_selection": False,
-            # No selection_start_time or selection_end_time
-        }
+        execution_plan = [_TRIM]
+        # No selection_start_time or selection_end_time
+        current_state = dict(_STATE_NO_TIME_SELECTION)
         
         resolved_plan, errors = self.resolver.resolve_missing_prerequisites(
             execution_plan, current_state
@@ -177,9 +191,7 @@ class TestResolveMissingPrerequisites(unittest.TestCase):
 
     def test_resolve_missing_prerequisites_uses_state_for_arguments(self):
         """Test resolving missing prerequisites uses state to determine arguments"""
-        execution_plan = [
-            {"tool_name": "trim_to_selection", "arguments": {}}
-        ]
+        execution_plan = [_TRIM]
         current_state = {
             "project_open": True,
             "has_time_selection": False,
@@ -200,16 +212,17 @@ class TestResolveMissingPrerequisites(unittest.TestCase):
 class TestOrderByDependencies(unittest.TestCase):
     """Test ordering by dependencies"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.resolver = PrerequisiteResolver(self.tool_registry)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures (the resolver is stateless)"""
+        cls.tool_registry = _NullRegistry()
+        cls.resolver = PrerequisiteResolver(cls.tool_registry)
 
     def test_order_by_dependencies_state_setters_first(self):
         """Test ordering puts state setters first"""
         execution_plan = [
-            {"tool_name": "trim_to_selection", "arguments": {}},
-            {"tool_name": "set_time_selection", "arguments": {"start_time": 10.0, "end_time": 20.0}}
+            _TRIM,
+            _SET_TIME_SELECTION
         ]
         
         ordered_plan, errors = self.resolver.order_by_dependencies(execution_plan)
@@ -222,9 +235,9 @@ class TestOrderByDependencies(unittest.TestCase):
     def test_order_by_dependencies_multiple_state_setters(self):
         """Test ordering with multiple state setters"""
         execution_plan = [
-            {"tool_name": "apply_normalize", "arguments": {}},
-            {"tool_name": "set_time_selection", "arguments": {"start_time": 10.0, "end_time": 20.0}},
-            {"tool_name": "select_all", "arguments": {}}
+            _NORMALIZE,
+            _SET_TIME_SELECTION,
+            _SELECT_ALL
         ]
         
         ordered_plan, errors = self.resolver.order_by_dependencies(execution_plan)
@@ -237,9 +250,9 @@ class TestOrderByDependencies(unittest.TestCase):
     def test_order_by_dependencies_handles_multiple_dependencies(self):
         """Test ordering handles multiple dependencies"""
         execution_plan = [
-            {"tool_name": "apply_normalize", "arguments": {}},
-            {"tool_name": "set_time_selection", "arguments": {"start_time": 10.0, "end_time": 20.0}},
-            {"tool_name": "select_all", "arguments": {}}
+            _NORMALIZE,
+            _SET_TIME_SELECTION,
+            _SELECT_ALL
         ]
         
         ordered_plan, errors = self.resolver.order_by_dependencies(execution_plan)
@@ -248,26 +261,32 @@ class TestOrderByDependencies(unittest.TestCase):
         # Should have all tools
         self.assertEqual(len(ordered_plan), 3)
 
+    def test_order_by_dependencies_preserves_relative_order(self):
+        """Test ordering keeps original order within setters and other tools"""
+        execution_plan = [_TRIM, _SET_TIME_SELECTION, _CUT, _SELECT_ALL]
+
+        ordered_plan, errors = self.resolver.order_by_dependencies(execution_plan)
+
+        self.assertEqual(len(errors), 0)
+        self.assertEqual(
+            [tc["tool_name"] for tc in ordered_plan],
+            ["set_time_selection", "select_all", "trim_to_selection", "cut"]
+        )
+
 
 class TestCompleteResolution(unittest.TestCase):
     """Test complete prerequisite resolution process"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.resolver = PrerequisiteResolver(self.tool_registry)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures (the resolver is stateless)"""
+        cls.tool_registry = _NullRegistry()
+        cls.resolver = PrerequisiteResolver(cls.tool_registry)
 
     def test_resolve_complete_flow(self):
         """Test complete resolution flow"""
-        execution_plan = [
-            {"tool_name": "trim_to_selection", "arguments": {}}
-        ]
-        current_state = {
-            "project_open": True,
-            "has_time_selection": False,
-            "selection_start_time": 10.0,
-            "selection_end_time": 20.0
-        }
+        execution_plan = [_TRIM]
+        current_state = dict(_STATE_SELECTION_NOT_SET)
         
         resolved_plan, errors = self.resolver.resolve(execution_plan, current_state)
         
@@ -278,14 +297,10 @@ class TestCompleteResolution(unittest.TestCase):
 
     def test_resolve_with_no_prerequisites_needed(self):
         """Test resolve when no prerequisites needed"""
-        execution_plan = [
-            {"tool_name": "play", "arguments": {}}
-        ]
-        current_state = {
-            "project_open": True
-        }
-        
-        resolved_plan, errors = self.resolver.resolve(execution_plan, current_state)
+        execution_plan = [_PLAY]
+        resolved_plan, errors = self.resolver.resolve(
+            execution_plan, dict(_STATE_PROJECT_OPEN)
+        )
         
         self.assertEqual(len(errors), 0)
         self.assertEqual(len(resolved_plan), 1)
@@ -294,4 +309,3 @@ class TestCompleteResolution(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
-
@@ -6,68 +6,107 @@ Tests state discovery including:
 - Determining required queries
 - Executing state queries
 - Building state snapshot
-- State caching
+- Fresh queries on every discovery
 """
 
-import unittest
-import sys
 import os
-from unittest.mock import Mock, MagicMock
+import sys
+import unittest
+from types import MappingProxyType
+from unittest.mock import Mock
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from state_discovery import StateDiscovery
 
 
+# The only ToolRegistry method StateDiscovery calls; registry mocks are
+# specced to it so any other attribute access fails instead of auto-creating
+_REGISTRY_QUERY_METHODS = ["execute_by_name"]
+
+# What FakeRegistry answers every query with unless a test overrides it
+_DEFAULT_RESPONSE = MappingProxyType({"success": True, "value": 10.0})
+
+# Shared read-only query results. build_state_snapshot() only reads them,
+# so they are built once at import instead of inside each test.
+_COMPLETE_RESULTS = MappingProxyType({
+    "has_time_selection": True,
+    "get_selection_start_time": 10.0,
+    "get_selection_end_time": 20.0,
+    "get_cursor_position": 15.0,
+    "get_total_project_time": 100.0,
+    "get_track_list": ({"id": "1", "name": "Track 1"},),
+    "get_selected_tracks": ("1",),
+    "get_selected_clips": ("clip1",),
+    "get_all_labels": ({"name": "intro", "start_time": 0.0, "end_time": 10.0},)
+})
+_PARTIAL_RESULTS = MappingProxyType({
+    "has_time_selection": False,
+    "get_selection_start_time": None,
+    "get_total_project_time": 50.0
+})
+_EMPTY_RESULTS = MappingProxyType({})
+
+
+class FakeRegistry:
+    """
+    Minimal registry double that counts execute_by_name calls.
+
+    response is returned for every query; it may also be a callable taking
+    (tool_name, arguments), or an exception instance to raise.
+    """
+
+    def __init__(self, response=None):
+        self.calls = 0
+        self.response = response if response is not None else _DEFAULT_RESPONSE
+
+    def execute_by_name(self, tool_name, arguments):
+        self.calls += 1
+        if isinstance(self.response, Exception):
+            raise self.response
+        if callable(self.response):
+            return self.response(tool_name, arguments)
+        return self.response
+
+
 class TestDetermineRequiredQueries(unittest.TestCase):
     """Test determining required queries"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.discovery = StateDiscovery(self.tool_registry)
-
-    def test_determine_queries_with_selection_keyword(self):
-        """Test determining queries with selection keyword"""
-        queries = self.discovery.determine_required_queries("select the audio")
-        self.assertIn("has_time_selection", queries)
-        self.assertIn("get_selection_start_time", queries)
-        self.assertIn("get_selection_end_time", queries)
-
-    def test_determine_queries_with_cursor_keyword(self):
-        """Test determining queries with cursor keyword"""
-        queries = self.discovery.determine_required_queries("at cursor position")
-        self.assertIn("get_cursor_position", queries)
-
-    def test_determine_queries_with_track_keyword(self):
-        """Test determining queries with track keyword"""
-        queries = self.discovery.determine_required_queries("list all tracks")
-        self.assertIn("get_track_list", queries)
-        self.assertIn("get_selected_tracks", queries)
-
-    def test_determine_queries_with_clip_keyword(self):
-        """Test determining queries with clip keyword"""
-        queries = self.discovery.determine_required_queries("split the clips")
-        self.assertIn("get_selected_clips", queries)
-
-    def test_determine_queries_with_label_keyword(self):
-        """Test determining queries with label keyword"""
-        queries = self.discovery.determine_required_queries("find the intro label")
-        self.assertIn("get_all_labels", queries)
-
-    def test_determine_queries_with_relative_time(self):
-        """Test determining queries with relative time keywords"""
-        queries = self.discovery.determine_required_queries("last 30 seconds")
-        self.assertIn("get_total_project_time", queries)
-
-    def test_determine_queries_default(self):
-        """Test determining queries with no specific keywords (default)"""
-        queries = self.discovery.determine_required_queries("hello")
-        # Should include project time and default queries
-        self.assertIn("get_total_project_time", queries)
-        self.assertIn("has_time_selection", queries)
-        self.assertIn("get_cursor_position", queries)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures (these tests never query the registry)"""
+        cls.tool_registry = Mock(spec=_REGISTRY_QUERY_METHODS)
+        cls.discovery = StateDiscovery(cls.tool_registry)
+
+    # (message, queries that must be requested for it)
+    KEYWORD_CASES = [
+        # Selection keyword
+        ("select the audio",
+         ["has_time_selection", "get_selection_start_time", "get_selection_end_time"]),
+        # Cursor keyword
+        ("at cursor position", ["get_cursor_position"]),
+        # Track keyword
+        ("list all tracks", ["get_track_list", "get_selected_tracks"]),
+        # Clip keyword
+        ("split the clips", ["get_selected_clips"]),
+        # Label keyword
+        ("find the intro label", ["get_all_labels"]),
+        # Relative time keyword
+        ("last 30 seconds", ["get_total_project_time"]),
+        # No specific keywords: project time plus default queries
+        ("hello", ["get_total_project_time", "has_time_selection", "get_cursor_position"]),
+    ]
+
+    def test_determine_queries_for_keywords(self):
+        """Test determining queries from message keywords"""
+        for message, expected_queries in self.KEYWORD_CASES:
+            with self.subTest(message=message):
+                queries = self.discovery.determine_required_queries(message)
+                for query in expected_queries:
+                    self.assertIn(query, queries)
 
     def test_determine_queries_with_existing_state(self):
         """Test determining queries when state already exists"""
@@ -87,23 +126,18 @@ class TestExecuteStateQueries(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures"""
-        self.tool_registry = Mock()
+        self.tool_registry = FakeRegistry()
         self.discovery = StateDiscovery(self.tool_registry)
 
     def test_execute_state_queries_success(self):
         """Test executing state queries successfully"""
-        self.tool_registry.execute_by_name.return_value = {
-            "success": True,
-            "value": 10.0
-        }
-        
         queries = ["get_selection_start_time", "get_selection_end_time"]
         results = self.discovery.execute_state_queries(queries)
         
         self.assertEqual(len(results), 2)
         self.assertEqual(results["get_selection_start_time"], 10.0)
         self.assertEqual(results["get_selection_end_time"], 10.0)
-        self.assertEqual(self.tool_registry.execute_by_name.call_count, 2)
+        self.assertEqual(self.tool_registry.calls, 2)
 
     def test_execute_state_queries_with_failure(self):
         """Test executing state queries with some failures"""
@@ -113,7 +147,7 @@ class TestExecuteStateQueries(unittest.TestCase):
             else:
                 return {"success": False, "error": "failed"}
         
-        self.tool_registry.execute_by_name.side_effect = mock_execute
+        self.tool_registry.response = mock_execute
         
         queries = ["get_selection_start_time", "get_selection_end_time"]
         results = self.discovery.execute_state_queries(queries)
@@ -124,37 +158,33 @@ class TestExecuteStateQueries(unittest.TestCase):
 
     def test_execute_state_queries_with_exception(self):
         """Test executing state queries with exception"""
-        self.tool_registry.execute_by_name.side_effect = Exception("test error")
+        self.tool_registry.response = Exception("test error")
         
         queries = ["get_selection_start_time"]
         results = self.discovery.execute_state_queries(queries)
         
         self.assertIsNone(results["get_selection_start_time"])
 
+    def test_execute_state_queries_skips_parameterized_queries(self):
+        """Test queries that need arguments are not sent to the registry"""
+        results = self.discovery.execute_state_queries(["get_clips_on_track", "action_enabled"])
+
+        self.assertEqual(results, {})
+        self.assertEqual(self.tool_registry.calls, 0)
+
 
 class TestBuildStateSnapshot(unittest.TestCase):
     """Test building state snapshot"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.discovery = StateDiscovery(self.tool_registry)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures (these tests never query the registry)"""
+        cls.tool_registry = Mock(spec=_REGISTRY_QUERY_METHODS)
+        cls.discovery = StateDiscovery(cls.tool_registry)
 
     def test_build_state_snapshot_complete(self):
         """Test building state snapshot with complete query results"""
-        query_results = {
-            "has_time_selection": True,
-            "get_selection_start_time": 10.0,
-            "get_selection_end_time": 20.0,
-            "get_cursor_position": 15.0,
-            "get_total_project_time": 100.0,
-            "get_track_list": [{"id": "1", "name": "Track 1"}],
-            "get_selected_tracks": ["1"],
-            "get_selected_clips": ["clip1"],
-            "get_all_labels": [{"name": "intro", "start_time": 0.0, "end_time": 10.0}]
-        }
-        
-        snapshot = self.discovery.build_state_snapshot(query_results)
+        snapshot = self.discovery.build_state_snapshot(_COMPLETE_RESULTS)
         
         self.assertTrue(snapshot["has_time_selection"])
         self.assertEqual(snapshot["selection_start_time"], 10.0)
@@ -169,26 +199,19 @@ class TestBuildStateSnapshot(unittest.TestCase):
 
     def test_build_state_snapshot_partial(self):
         """Test building state snapshot with partial query results"""
-        query_results = {
-            "has_time_selection": False,
-            "get_selection_start_time": None,
-            "get_total_project_time": 50.0
-        }
-
-        snapshot = self.discovery.build_state_snapshot(query_results)
+        snapshot = self.discovery.build_state_snapshot(_PARTIAL_RESULTS)
 
         self.assertFalse(snapshot["has_time_selection"])
         self.assertEqual(snapshot["selection_start_time"], 0.0)  # Default for None
         self.assertEqual(snapshot["total_project_time"], 50.0)
-        # track_list is not in query_results so it won't be in snapshot
+        # track_list is not in the query results so it won't be in snapshot
         self.assertEqual(snapshot.get("track_list", []), [])
         # project_open is True if any results were added to snapshot
         self.assertTrue(snapshot["project_open"])
 
     def test_build_state_snapshot_empty(self):
         """Test building state snapshot with empty results"""
-        query_results = {}
-        snapshot = self.discovery.build_state_snapshot(query_results)
+        snapshot = self.discovery.build_state_snapshot(_EMPTY_RESULTS)
 
         # Should have defaults (or be missing keys)
         self.assertFalse(snapshot.get("has_time_selection", False))
@@ -200,53 +223,53 @@ class TestBuildStateSnapshot(unittest.TestCase):
         self.assertFalse(snapshot.get("project_open", False))
 
 
-class TestStateCaching(unittest.TestCase):
-    """Test state caching"""
+class TestFreshDiscovery(unittest.TestCase):
+    """Test that discovery never serves stale snapshots"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up one registry and discovery shared by these tests"""
+        cls.tool_registry = FakeRegistry()
+        cls.discovery = StateDiscovery(cls.tool_registry)
 
     def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.discovery = StateDiscovery(self.tool_registry)
+        """Start every test with a fresh call count and the default response"""
+        self.tool_registry.calls = 0
+        self.tool_registry.response = _DEFAULT_RESPONSE
 
-    def test_state_caching(self):
-        """Test state caching avoids redundant queries"""
-        self.tool_registry.execute_by_name.return_value = {
-            "success": True,
-            "value": 10.0
-        }
-        
-        # First discovery
+    def test_repeated_discovery_queries_again(self):
+        """Test each discovery queries the current state instead of reusing a snapshot"""
+        # Project state can change between requests, so nothing is cached
         state1 = self.discovery.discover_state("test message")
-        call_count_1 = self.tool_registry.execute_by_name.call_count
-        
-        # Second discovery (should use cache)
+        call_count_1 = self.tool_registry.calls
+
         state2 = self.discovery.discover_state("test message")
-        call_count_2 = self.tool_registry.execute_by_name.call_count
-        
-        # Should not have made additional calls
-        self.assertEqual(call_count_1, call_count_2)
+
+        self.assertGreater(self.tool_registry.calls, call_count_1)
         self.assertEqual(state1, state2)
 
-    def test_state_cache_invalidation(self):
-        """Test state cache invalidation"""
-        self.tool_registry.execute_by_name.return_value = {
-            "success": True,
-            "value": 10.0
-        }
-        
-        # First discovery
-        self.discovery.discover_state("test message")
-        call_count_1 = self.tool_registry.execute_by_name.call_count
-        
-        # Invalidate cache
-        self.discovery.invalidate_cache()
-        
-        # Second discovery (should query again)
-        self.discovery.discover_state("test message")
-        call_count_2 = self.tool_registry.execute_by_name.call_count
-        
-        # Should have made additional calls
-        self.assertGreater(call_count_2, call_count_1)
+    def test_discovery_with_current_state_does_not_leak_into_later_calls(self):
+        """Test a later discovery without current_state queries again"""
+        caller_state = {"selection_start_time": 99.0, "project_open": False}
+        self.discovery.discover_state("cut this", caller_state)
+        call_count_1 = self.tool_registry.calls
+
+        snapshot = self.discovery.discover_state("cut this")
+
+        self.assertGreater(self.tool_registry.calls, call_count_1)
+        # The earlier caller's state must not be served back
+        self.assertNotEqual(snapshot.get("selection_start_time"), 99.0)
+        self.assertTrue(snapshot["project_open"])
+
+    def test_different_message_runs_its_own_queries(self):
+        """Test a different message is not served another message's snapshot"""
+        self.discovery.discover_state("select the audio")
+        call_count_1 = self.tool_registry.calls
+
+        # Label queries were not part of the first discovery
+        snapshot = self.discovery.discover_state("find the intro label")
+        self.assertGreater(self.tool_registry.calls, call_count_1)
+        self.assertIn("all_labels", snapshot)
 
     def test_state_discovery_with_current_state(self):
         """Test state discovery with existing state"""
@@ -255,10 +278,7 @@ class TestStateCaching(unittest.TestCase):
             "selection_start_time": 10.0
         }
         
-        self.tool_registry.execute_by_name.return_value = {
-            "success": True,
-            "value": 20.0
-        }
+        self.tool_registry.response = {"success": True, "value": 20.0}
         
         snapshot = self.discovery.discover_state("test", current_state)
         
@@ -269,4 +289,3 @@ class TestStateCaching(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
-
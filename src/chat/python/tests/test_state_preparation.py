@@ -3,12 +3,15 @@
 Unit tests for state_preparation.py
 """
 
-import sys
 import os
+import sys
 import unittest
+from types import MappingProxyType
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from state_preparation import (
     StatePreparationOrchestrator,
@@ -18,38 +21,70 @@ from state_preparation import (
 )
 
 
+# Stateless between calls, so every test shares one instance
+_ORCHESTRATOR = StatePreparationOrchestrator()
+
+# Shared read-only state snapshots. prepare() copies the state it is given
+# before simulating preparation steps, so tests can pass these directly.
+_STATE_EMPTY = MappingProxyType({})
+_STATE_ONE_TRACK = MappingProxyType({"track_list": [1]})
+_STATE_CURSOR = MappingProxyType({"cursor_position": 10.0})
+_STATE_FULL_SELECTION = MappingProxyType({
+    "has_time_selection": True,
+    "selection_start_time": 5.0,
+    "selection_end_time": 15.0,
+    "selected_tracks": [1, 2]
+})
+
+
+def _expected_ready(operation_tool, time_selection):
+    """Golden to_comparable() value: select a time range on all tracks, then run."""
+    start_time, end_time = time_selection
+    return {
+        "ready_to_execute": True,
+        "preparation_steps": [
+            ("set_time_selection", {"start_time": start_time, "end_time": end_time}),
+            ("select_all_tracks", {}),
+        ],
+        "operation_tool": operation_tool,
+        "operation_arguments": {},
+        "error": None,
+        "needs_clarification": False,
+        "clarification_message": None
+    }
+
+
 class TestStatePreparationBasics(unittest.TestCase):
     """Test basic StatePreparationOrchestrator functionality."""
 
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
-
     def test_tool_with_no_requirements_ready_immediately(self):
         """Tools with no requirements should be ready immediately."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="play",
             tool_arguments={},
             user_message="play",
-            initial_state={}
+            initial_state=_STATE_EMPTY
         )
         self.assertTrue(result.ready_to_execute)
         self.assertEqual(len(result.preparation_steps), 0)
         self.assertFalse(result.needs_clarification)
 
+    def test_max_iterations_error(self):
+        """Should error if max iterations exceeded (edge case)."""
+        # This is hard to trigger naturally, but we verify the limit exists
+        self.assertEqual(_ORCHESTRATOR.MAX_ITERATIONS, 5)
+
 
 class TestSplitAtTimePreparation(unittest.TestCase):
     """Test state preparation for split_at_time."""
 
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
-
     def test_split_at_time_with_time_ready(self):
         """split_at_time with time argument should be ready."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="split_at_time",
             tool_arguments={"time": 20.0},
             user_message="split at 20 seconds",
-            initial_state={}
+            initial_state=_STATE_EMPTY
         )
         self.assertTrue(result.ready_to_execute)
         self.assertEqual(len(result.preparation_steps), 0)
@@ -57,18 +92,18 @@ class TestSplitAtTimePreparation(unittest.TestCase):
 
     def test_split_at_time_infers_from_message(self):
         """split_at_time without time should infer from message."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="split_at_time",
             tool_arguments={},
             user_message="split at 25 seconds",
-            initial_state={}
+            initial_state=_STATE_EMPTY
         )
         self.assertTrue(result.ready_to_execute)
         self.assertEqual(result.operation_arguments["time"], 25.0)
 
     def test_split_at_time_infers_from_cursor(self):
         """split_at_time without explicit time uses cursor as fallback."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="split_at_time",
             tool_arguments={},
             user_message="split",
@@ -79,11 +114,11 @@ class TestSplitAtTimePreparation(unittest.TestCase):
 
     def test_split_at_time_needs_clarification_without_info(self):
         """split_at_time without time or cursor needs clarification."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="split_at_time",
             tool_arguments={},
             user_message="split",
-            initial_state={}
+            initial_state=_STATE_EMPTY
         )
         self.assertFalse(result.ready_to_execute)
         self.assertTrue(result.needs_clarification)
@@ -93,28 +128,20 @@ class TestSplitAtTimePreparation(unittest.TestCase):
 class TestTrimToSelectionPreparation(unittest.TestCase):
     """Test state preparation for trim_to_selection."""
 
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
-
     def test_trim_with_selection_ready(self):
         """trim_to_selection with existing selection should be ready."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="trim_to_selection",
             tool_arguments={},
             user_message="trim",
-            initial_state={
-                "has_time_selection": True,
-                "selection_start_time": 5.0,
-                "selection_end_time": 15.0,
-                "selected_tracks": [1, 2]
-            }
+            initial_state=_STATE_FULL_SELECTION
         )
         self.assertTrue(result.ready_to_execute)
         self.assertEqual(len(result.preparation_steps), 0)
 
     def test_trim_first_30_seconds_generates_steps(self):
         """'trim first 30 seconds' should generate set_time_selection and select_all_tracks."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="trim_to_selection",
             tool_arguments={},
             user_message="trim first 30 seconds",
@@ -123,81 +150,53 @@ class TestTrimToSelectionPreparation(unittest.TestCase):
                 "total_project_time": 120.0
             }
         )
-        self.assertTrue(result.ready_to_execute)
-
-        # Should have preparation steps
-        self.assertGreater(len(result.preparation_steps), 0)
-
-        # Should have set_time_selection step
-        time_step = next((s for s in result.preparation_steps if s.tool_name == "set_time_selection"), None)
-        self.assertIsNotNone(time_step)
-        self.assertEqual(time_step.arguments["start_time"], 0.0)
-        self.assertEqual(time_step.arguments["end_time"], 30.0)
-
-        # Should have select_all_tracks step
-        track_step = next((s for s in result.preparation_steps if s.tool_name == "select_all_tracks"), None)
-        self.assertIsNotNone(track_step)
+        self.assertEqual(
+            result.to_comparable(),
+            _expected_ready("trim_to_selection", (0.0, 30.0))
+        )
 
     def test_trim_without_info_needs_clarification(self):
         """'trim' without selection or time range needs clarification."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="trim_to_selection",
             tool_arguments={},
             user_message="trim",
-            initial_state={"track_list": [1]}
+            initial_state=_STATE_ONE_TRACK
         )
         self.assertFalse(result.ready_to_execute)
         self.assertTrue(result.needs_clarification)
 
 
-class TestCutPreparation(unittest.TestCase):
-    """Test state preparation for cut."""
-
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
+class TestEditPreparation(unittest.TestCase):
+    """Test state preparation for cut, delete_selection and paste."""
 
     def test_cut_with_selection_ready(self):
         """cut with existing selection should be ready."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="cut",
             tool_arguments={},
             user_message="cut",
-            initial_state={
-                "has_time_selection": True,
-                "selection_start_time": 10.0,
-                "selection_end_time": 20.0,
-                "selected_tracks": [1]
-            }
+            initial_state=_STATE_FULL_SELECTION
         )
         self.assertTrue(result.ready_to_execute)
         self.assertEqual(len(result.preparation_steps), 0)
 
     def test_cut_from_10_to_20_generates_steps(self):
         """'cut from 10 to 20 seconds' should generate preparation steps."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="cut",
             tool_arguments={},
             user_message="cut from 10 to 20 seconds",
             initial_state={"track_list": [1, 2]}
         )
-        self.assertTrue(result.ready_to_execute)
-
-        # Should have set_time_selection step
-        time_step = next((s for s in result.preparation_steps if s.tool_name == "set_time_selection"), None)
-        self.assertIsNotNone(time_step)
-        self.assertEqual(time_step.arguments["start_time"], 10.0)
-        self.assertEqual(time_step.arguments["end_time"], 20.0)
-
-
-class TestDeleteLastXSecondsPreparation(unittest.TestCase):
-    """Test state preparation for delete with relative time."""
-
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
+        self.assertEqual(
+            result.to_comparable(),
+            _expected_ready("cut", (10.0, 20.0))
+        )
 
     def test_delete_last_10_seconds(self):
         """'delete last 10 seconds' should calculate from project duration."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="delete_selection",
             tool_arguments={},
             user_message="delete last 10 seconds",
@@ -206,27 +205,18 @@ class TestDeleteLastXSecondsPreparation(unittest.TestCase):
                 "track_list": [1]
             }
         )
-        self.assertTrue(result.ready_to_execute)
-
-        time_step = next((s for s in result.preparation_steps if s.tool_name == "set_time_selection"), None)
-        self.assertIsNotNone(time_step)
-        self.assertEqual(time_step.arguments["start_time"], 50.0)
-        self.assertEqual(time_step.arguments["end_time"], 60.0)
-
-
-class TestPastePreparation(unittest.TestCase):
-    """Test state preparation for paste."""
-
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
+        self.assertEqual(
+            result.to_comparable(),
+            _expected_ready("delete_selection", (50.0, 60.0))
+        )
 
     def test_paste_with_cursor_ready(self):
         """paste with cursor position should be ready."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="paste",
             tool_arguments={},
             user_message="paste",
-            initial_state={"cursor_position": 10.0}
+            initial_state=_STATE_CURSOR
         )
         self.assertTrue(result.ready_to_execute)
         self.assertEqual(len(result.preparation_steps), 0)
@@ -235,34 +225,39 @@ class TestPastePreparation(unittest.TestCase):
 class TestPreparationStepGeneration(unittest.TestCase):
     """Test preparation step generation details."""
 
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
-
     def test_steps_have_purpose(self):
         """All preparation steps should have a purpose description."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="trim_to_selection",
             tool_arguments={},
             user_message="trim first 30 seconds",
-            initial_state={"track_list": [1]}
+            initial_state=_STATE_ONE_TRACK
         )
 
-        for step in result.preparation_steps:
-            self.assertIsInstance(step.purpose, str)
-            self.assertGreater(len(step.purpose), 0)
+        # PreparationStep rejects an empty purpose at construction
+        self.assertTrue(result.preparation_steps)
 
     def test_steps_have_tool_name(self):
         """All preparation steps should have tool_name."""
-        result = self.orchestrator.prepare(
+        result = _ORCHESTRATOR.prepare(
             tool_name="cut",
             tool_arguments={},
             user_message="cut from 5 to 10 seconds",
-            initial_state={"track_list": [1]}
+            initial_state=_STATE_ONE_TRACK
         )
 
-        for step in result.preparation_steps:
-            self.assertIsInstance(step.tool_name, str)
-            self.assertGreater(len(step.tool_name), 0)
+        # PreparationStep rejects an empty tool_name at construction
+        self.assertTrue(result.preparation_steps)
+
+    def test_step_rejects_empty_tool_name(self):
+        """PreparationStep should refuse an empty tool_name."""
+        with self.assertRaises(ValueError):
+            PreparationStep(tool_name="", arguments={}, purpose="Select all tracks")
+
+    def test_step_rejects_empty_purpose(self):
+        """PreparationStep should refuse an empty purpose."""
+        with self.assertRaises(ValueError):
+            PreparationStep(tool_name="select_all_tracks", arguments={}, purpose="")
 
 
 class TestConvenienceFunction(unittest.TestCase):
@@ -274,18 +269,15 @@ class TestConvenienceFunction(unittest.TestCase):
             tool_name="play",
             tool_arguments={},
             user_message="play",
-            current_state={}
+            current_state=_STATE_EMPTY
         )
-        self.assertIsInstance(result, PreparationResult)
+        self.assertIs(type(result), PreparationResult)
         self.assertTrue(result.ready_to_execute)
 
 
 class TestMultipleToolPreparation(unittest.TestCase):
     """Test preparing multiple tools in sequence."""
 
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
-
     def test_prepare_multiple_tools(self):
         """Test preparing multiple tools that build on each other."""
         tool_calls = [
@@ -293,28 +285,29 @@ class TestMultipleToolPreparation(unittest.TestCase):
             {"tool_name": "cut", "arguments": {}}
         ]
 
-        results = self.orchestrator.prepare_multiple_tools(
+        results = _ORCHESTRATOR.prepare_multiple_tools(
             tool_calls=tool_calls,
             user_message="cut first 30 seconds",
             initial_state={"track_list": [1], "selected_tracks": [1]}
         )
 
         # Both should be ready
-        self.assertEqual(len(results), 2)
-        self.assertTrue(results[0].ready_to_execute)
-        self.assertTrue(results[1].ready_to_execute)
-
-
-class TestIterationLimit(unittest.TestCase):
-    """Test iteration limit handling."""
-
-    def setUp(self):
-        self.orchestrator = StatePreparationOrchestrator()
+        self.assertEqual([r.ready_to_execute for r in results], [True, True])
+
+    def test_prepare_multiple_tools_leaves_initial_state_untouched(self):
+        """Steps are simulated on a private copy of the initial state."""
+        initial_state = {"track_list": [1, 2]}
+        results = _ORCHESTRATOR.prepare_multiple_tools(
+            tool_calls=[
+                {"tool_name": "cut", "arguments": {}},
+                {"tool_name": "paste", "arguments": {}}
+            ],
+            user_message="cut from 10 to 20 seconds",
+            initial_state=initial_state
+        )
 
-    def test_max_iterations_error(self):
-        """Should error if max iterations exceeded (edge case)."""
-        # This is hard to trigger naturally, but we verify the limit exists
-        self.assertEqual(self.orchestrator.MAX_ITERATIONS, 5)
+        self.assertTrue(results[0].preparation_steps)
+        self.assertEqual(initial_state, {"track_list": [1, 2]})
 
 
 if __name__ == "__main__":
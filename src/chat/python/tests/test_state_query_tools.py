@@ -10,18 +10,20 @@ Tests the state query infrastructure including:
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
+from unittest.mock import Mock, MagicMock
+import collections
 import json
 import threading
-import queue
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from tools import ToolExecutor, StateQueryTools, ToolRegistry
-from tool_schemas import TOOL_DEFINITIONS, FUNCTION_CALLING_SYSTEM_PROMPT
+from tool_schemas import TOOL_DEFINITIONS, TOOL_DEFINITIONS_BY_NAME, FUNCTION_CALLING_SYSTEM_PROMPT
 
 
 class MockStdout:
@@ -38,14 +40,24 @@ class MockStdout:
 
 
 class MockStdin:
-    """Mock stdin that can simulate responses"""
-    def __init__(self):
-        self.responses = queue.Queue()
+    """Mock stdin that can simulate responses
+
+    With decoded=True responses are handed over as dicts, for an executor
+    whose _raw_objects hook is set, skipping the JSON round trip.
+    """
+    def __init__(self, decoded=False):
+        self.responses = collections.deque()
+        self._fed = threading.Event()
+        self.decoded = decoded
         self.closed = False
 
     def add_response(self, response_dict):
         """Add a response to be read"""
-        self.responses.put(json.dumps(response_dict) + "\n")
+        if self.decoded:
+            self.responses.append(response_dict)
+        else:
+            self.responses.append(json.dumps(response_dict) + "\n")
+        self._fed.set()
 
     def __iter__(self):
         return self
@@ -53,245 +65,177 @@ class MockStdin:
     def __next__(self):
         if self.closed:
             raise StopIteration
+        # Wait (briefly) only for the first response; once fed, an empty
+        # buffer ends the input straight away
+        if not self._fed.wait(timeout=0.1):
+            raise StopIteration
         try:
-            return self.responses.get(timeout=0.1)
-        except queue.Empty:
+            return self.responses.popleft()
+        except IndexError:
             raise StopIteration
 
 
+# Every state query tool, as registered and as defined for the LLM
+_STATE_QUERY_TOOL_NAMES = frozenset({
+    "get_selection_start_time",
+    "get_selection_end_time",
+    "has_time_selection",
+    "get_selected_tracks",
+    "get_selected_clips",
+    "get_cursor_position",
+    "get_total_project_time",
+    "get_track_list",
+    "get_clips_on_track",
+    "get_all_labels",
+    "action_enabled",
+})
+
+# Shared query payloads (read-only: StateQueryTools returns them unchanged)
+_TWO_CLIPS = (
+    {"track_id": "track_1", "clip_id": "clip_1"},
+    {"track_id": "track_1", "clip_id": "clip_2"},
+)
+_TWO_TRACKS = (
+    {"track_id": "track_1", "name": "Track 1", "type": "audio"},
+    {"track_id": "track_2", "name": "Track 2", "type": "audio"},
+)
+
+
 class TestStateQueryTools(unittest.TestCase):
     """Test StateQueryTools class"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.mock_stdout = MockStdout()
-        self.executor = ToolExecutor(stdout=self.mock_stdout)
-        self.state_tools = StateQueryTools(self.executor)
-
-    def test_get_selection_start_time_with_selection(self):
-        """Test get_selection_start_time with valid selection"""
-        # Mock the executor's execute_state_query to return a successful result
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": 5.5}
-            result = self.state_tools.get_selection_start_time()
-            self.assertEqual(result, 5.5)
-            mock_query.assert_called_once_with("get_selection_start_time")
-
-    def test_get_selection_start_time_no_selection(self):
-        """Test get_selection_start_time with no selection"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": 0.0}
-            result = self.state_tools.get_selection_start_time()
-            self.assertEqual(result, 0.0)
-
-    def test_get_selection_start_time_failure(self):
-        """Test get_selection_start_time when query fails"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": False, "error": "State reader not available"}
-            result = self.state_tools.get_selection_start_time()
-            self.assertIsNone(result)
-
-    def test_get_selection_end_time_with_selection(self):
-        """Test get_selection_end_time with valid selection"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": 10.5}
-            result = self.state_tools.get_selection_end_time()
-            self.assertEqual(result, 10.5)
-            mock_query.assert_called_once_with("get_selection_end_time")
-
-    def test_get_selection_end_time_no_selection(self):
-        """Test get_selection_end_time with no selection"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": 0.0}
-            result = self.state_tools.get_selection_end_time()
-            self.assertEqual(result, 0.0)
-
-    def test_has_time_selection_true(self):
-        """Test has_time_selection returns True when selection exists"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": True}
-            result = self.state_tools.has_time_selection()
-            self.assertTrue(result)
-            mock_query.assert_called_once_with("has_time_selection")
-
-    def test_has_time_selection_false(self):
-        """Test has_time_selection returns False when no selection"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": False}
-            result = self.state_tools.has_time_selection()
-            self.assertFalse(result)
-
-    def test_get_selected_tracks_with_selection(self):
-        """Test get_selected_tracks with selected tracks"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {
-                "success": True,
-                "value": ["track_1", "track_2"]
-            }
-            result = self.state_tools.get_selected_tracks()
-            self.assertEqual(result, ["track_1", "track_2"])
-            mock_query.assert_called_once_with("get_selected_tracks")
-
-    def test_get_selected_tracks_no_selection(self):
-        """Test get_selected_tracks with no tracks selected"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": []}
-            result = self.state_tools.get_selected_tracks()
-            self.assertEqual(result, [])
-
-    def test_get_selected_clips_with_selection(self):
-        """Test get_selected_clips with selected clips"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {
-                "success": True,
-                "value": [
-                    {"track_id": "track_1", "clip_id": "clip_1"},
-                    {"track_id": "track_1", "clip_id": "clip_2"}
-                ]
-            }
-            result = self.state_tools.get_selected_clips()
-            self.assertEqual(len(result), 2)
-            self.assertEqual(result[0]["track_id"], "track_1")
-            mock_query.assert_called_once_with("get_selected_clips")
-
-    def test_get_selected_clips_no_selection(self):
-        """Test get_selected_clips with no clips selected"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": []}
-            result = self.state_tools.get_selected_clips()
-            self.assertEqual(result, [])
-
-    def test_get_cursor_position(self):
-        """Test get_cursor_position returns valid time"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": 15.3}
-            result = self.state_tools.get_cursor_position()
-            self.assertEqual(result, 15.3)
-            mock_query.assert_called_once_with("get_cursor_position")
-
-    def test_get_cursor_position_unavailable(self):
-        """Test get_cursor_position when playback state not available"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {
-                "success": False,
-                "error": "Playback state not available"
-            }
-            result = self.state_tools.get_cursor_position()
-            self.assertIsNone(result)
-
-    def test_get_total_project_time(self):
-        """Test get_total_project_time returns project duration"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": 120.5}
-            result = self.state_tools.get_total_project_time()
-            self.assertEqual(result, 120.5)
-            mock_query.assert_called_once_with("get_total_project_time")
-
-    def test_get_track_list(self):
-        """Test get_track_list returns list of tracks"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {
-                "success": True,
-                "value": [
-                    {"track_id": "track_1", "name": "Track 1", "type": "audio"},
-                    {"track_id": "track_2", "name": "Track 2", "type": "audio"}
-                ]
-            }
-            result = self.state_tools.get_track_list()
-            self.assertEqual(len(result), 2)
-            self.assertEqual(result[0]["track_id"], "track_1")
-            mock_query.assert_called_once_with("get_track_list")
-
-    def test_get_clips_on_track_valid(self):
-        """Test get_clips_on_track with valid track"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {
-                "success": True,
-                "value": [
-                    {"track_id": "track_1", "clip_id": "clip_1"},
-                    {"track_id": "track_1", "clip_id": "clip_2"}
-                ]
-            }
-            result = self.state_tools.get_clips_on_track("track_1")
-            self.assertEqual(len(result), 2)
-            mock_query.assert_called_once_with("get_clips_on_track", {"track_id": "track_1"})
-
-    def test_get_clips_on_track_invalid(self):
-        """Test get_clips_on_track with invalid track"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": []}
-            result = self.state_tools.get_clips_on_track("invalid_track")
-            self.assertEqual(result, [])
-
-    def test_get_all_labels(self):
-        """Test get_all_labels returns label data"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": []}
-            result = self.state_tools.get_all_labels()
-            self.assertEqual(result, [])
-            mock_query.assert_called_once_with("get_all_labels")
-
-    def test_action_enabled_true(self):
-        """Test action_enabled with enabled action"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": True}
-            result = self.state_tools.action_enabled("action://trackedit/undo")
-            self.assertTrue(result)
-            mock_query.assert_called_once_with(
-                "action_enabled",
-                {"action_code": "action://trackedit/undo"}
-            )
-
-    def test_action_enabled_false(self):
-        """Test action_enabled with disabled action"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {"success": True, "value": False}
-            result = self.state_tools.action_enabled("action://trackedit/redo")
-            self.assertFalse(result)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by every test in the class"""
+        # Every test stubs execute_state_query before querying, so the
+        # executor never writes or waits and can be shared
+        cls.mock_stdout = MockStdout()
+        cls.executor = ToolExecutor(stdout=cls.mock_stdout)
+        cls.state_tools = StateQueryTools(cls.executor)
+
+    def _stub(self, return_value):
+        """Replace execute_state_query on the shared executor with a Mock"""
+        mock_query = Mock(return_value=return_value)
+        self.executor.execute_state_query = mock_query
+        return mock_query
+
+    # (case, method, method arguments, expected execute_state_query
+    #  arguments, stubbed query result, expected return value)
+    CASES = (
+        ("selection_start_time", "get_selection_start_time", (),
+         ("get_selection_start_time",),
+         {"success": True, "value": 5.5}, 5.5),
+        ("selection_start_time_no_selection", "get_selection_start_time", (),
+         ("get_selection_start_time",),
+         {"success": True, "value": 0.0}, 0.0),
+        ("selection_start_time_failure", "get_selection_start_time", (),
+         ("get_selection_start_time",),
+         {"success": False, "error": "State reader not available"}, None),
+        ("selection_end_time", "get_selection_end_time", (),
+         ("get_selection_end_time",),
+         {"success": True, "value": 10.5}, 10.5),
+        ("selection_end_time_no_selection", "get_selection_end_time", (),
+         ("get_selection_end_time",),
+         {"success": True, "value": 0.0}, 0.0),
+        ("has_time_selection_true", "has_time_selection", (),
+         ("has_time_selection",),
+         {"success": True, "value": True}, True),
+        ("has_time_selection_false", "has_time_selection", (),
+         ("has_time_selection",),
+         {"success": True, "value": False}, False),
+        ("selected_tracks", "get_selected_tracks", (),
+         ("get_selected_tracks",),
+         {"success": True, "value": ["track_1", "track_2"]}, ["track_1", "track_2"]),
+        ("selected_tracks_none", "get_selected_tracks", (),
+         ("get_selected_tracks",),
+         {"success": True, "value": []}, []),
+        ("selected_clips", "get_selected_clips", (),
+         ("get_selected_clips",),
+         {"success": True, "value": _TWO_CLIPS}, _TWO_CLIPS),
+        ("selected_clips_none", "get_selected_clips", (),
+         ("get_selected_clips",),
+         {"success": True, "value": []}, []),
+        ("cursor_position", "get_cursor_position", (),
+         ("get_cursor_position",),
+         {"success": True, "value": 15.3}, 15.3),
+        ("cursor_position_unavailable", "get_cursor_position", (),
+         ("get_cursor_position",),
+         {"success": False, "error": "Playback state not available"}, None),
+        ("total_project_time", "get_total_project_time", (),
+         ("get_total_project_time",),
+         {"success": True, "value": 120.5}, 120.5),
+        ("track_list", "get_track_list", (),
+         ("get_track_list",),
+         {"success": True, "value": _TWO_TRACKS}, _TWO_TRACKS),
+        ("clips_on_track", "get_clips_on_track", ("track_1",),
+         ("get_clips_on_track", {"track_id": "track_1"}),
+         {"success": True, "value": _TWO_CLIPS}, _TWO_CLIPS),
+        ("clips_on_invalid_track", "get_clips_on_track", ("invalid_track",),
+         ("get_clips_on_track", {"track_id": "invalid_track"}),
+         {"success": True, "value": []}, []),
+        ("all_labels", "get_all_labels", (),
+         ("get_all_labels",),
+         {"success": True, "value": []}, []),
+        ("action_enabled_true", "action_enabled", ("action://trackedit/undo",),
+         ("action_enabled", {"action_code": "action://trackedit/undo"}),
+         {"success": True, "value": True}, True),
+        ("action_enabled_false", "action_enabled", ("action://trackedit/redo",),
+         ("action_enabled", {"action_code": "action://trackedit/redo"}),
+         {"success": True, "value": False}, False),
+    )
+
+    def test_state_query_cases(self):
+        """Each query method forwards its query and unwraps the result"""
+        for case, method, args, query_args, query_result, expected in self.CASES:
+            with self.subTest(case=case):
+                mock_query = self._stub(query_result)
+                result = getattr(self.state_tools, method)(*args)
+                self.assertEqual(result, expected)
+                # Plain tuple comparison of (count, args, kwargs); indexing
+                # call_args keeps this working before Python 3.8
+                self.assertEqual(
+                    (mock_query.call_count, mock_query.call_args[0], mock_query.call_args[1]),
+                    (1, query_args, {})
+                )
 
 
 class TestToolRegistryIntegration(unittest.TestCase):
     """Test ToolRegistry integration with state query tools"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.mock_stdout = MockStdout()
-        self.executor = ToolExecutor(stdout=self.mock_stdout)
-        self.registry = ToolRegistry(self.executor)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by every test in the class"""
+        # Tests only read the tool map or stub state methods for their own
+        # duration, so one registry serves them all
+        cls.mock_stdout = MockStdout()
+        cls.executor = ToolExecutor(stdout=cls.mock_stdout)
+        cls.registry = ToolRegistry(cls.executor)
+
+    def _stub_state(self, method_name, return_value):
+        """Shadow a StateQueryTools method with a Mock until the test ends"""
+        mock_method = Mock(return_value=return_value)
+        setattr(self.registry.state, method_name, mock_method)
+        # Deleting the instance attribute uncovers the class method again
+        self.addCleanup(delattr, self.registry.state, method_name)
+        return mock_method
 
     def test_state_query_tools_registered(self):
         """Test state query tools are registered in _tool_map"""
-        state_query_tools = [
-            "get_selection_start_time",
-            "get_selection_end_time",
-            "has_time_selection",
-            "get_selected_tracks",
-            "get_selected_clips",
-            "get_cursor_position",
-            "get_total_project_time",
-            "get_track_list",
-            "get_clips_on_track",
-            "get_all_labels",
-            "action_enabled",
-        ]
-        for tool_name in state_query_tools:
-            self.assertIn(tool_name, self.registry._tool_map, f"{tool_name} not in tool map")
+        self.assertLessEqual(_STATE_QUERY_TOOL_NAMES, self.registry._tool_map.keys())
 
     def test_execute_by_name_state_query(self):
         """Test execute_by_name works for state queries"""
-        with patch.object(self.registry.state, 'get_selection_start_time') as mock_method:
-            mock_method.return_value = 5.5
-            result = self.registry.execute_by_name("get_selection_start_time", {})
-            self.assertTrue(result.get("success"))
-            self.assertEqual(result.get("value"), 5.5)
+        self._stub_state("get_selection_start_time", 5.5)
+        result = self.registry.execute_by_name("get_selection_start_time", {})
+        self.assertTrue(result.get("success"))
+        self.assertEqual(result.get("value"), 5.5)
 
     def test_execute_by_name_state_query_with_params(self):
         """Test execute_by_name with state query that requires parameters"""
-        with patch.object(self.registry.state, 'get_clips_on_track') as mock_method:
-            mock_method.return_value = []
-            result = self.registry.execute_by_name("get_clips_on_track", {"track_id": "track_1"})
-            self.assertTrue(result.get("success"))
-            mock_method.assert_called_once_with("track_1")
+        mock_method = self._stub_state("get_clips_on_track", [])
+        result = self.registry.execute_by_name("get_clips_on_track", {"track_id": "track_1"})
+        self.assertTrue(result.get("success"))
+        mock_method.assert_called_once_with("track_1")
 
     def test_execute_by_name_unknown_tool(self):
         """Test error handling for unknown state query tools"""
@@ -305,38 +249,19 @@ class TestToolSchemas(unittest.TestCase):
 
     def test_all_state_query_tools_in_definitions(self):
         """Test all state query tools are in TOOL_DEFINITIONS"""
-        state_query_tools = [
-            "get_selection_start_time",
-            "get_selection_end_time",
-            "has_time_selection",
-            "get_selected_tracks",
-            "get_selected_clips",
-            "get_cursor_position",
-            "get_total_project_time",
-            "get_track_list",
-            "get_clips_on_track",
-            "get_all_labels",
-            "action_enabled",
-        ]
-        tool_names = [tool["function"]["name"] for tool in TOOL_DEFINITIONS]
-        for tool_name in state_query_tools:
-            self.assertIn(tool_name, tool_names, f"{tool_name} not in TOOL_DEFINITIONS")
+        self.assertLessEqual(_STATE_QUERY_TOOL_NAMES, TOOL_DEFINITIONS_BY_NAME.keys())
 
     def test_parameter_validation(self):
         """Test parameter validation for state query tools"""
         # Tools that require parameters
-        get_clips_on_track = next(
-            t for t in TOOL_DEFINITIONS if t["function"]["name"] == "get_clips_on_track"
-        )
+        get_clips_on_track = TOOL_DEFINITIONS_BY_NAME["get_clips_on_track"]
         self.assertIn("track_id", get_clips_on_track["function"]["parameters"]["required"])
         self.assertEqual(
             get_clips_on_track["function"]["parameters"]["properties"]["track_id"]["type"],
             "string"
         )
 
-        action_enabled = next(
-            t for t in TOOL_DEFINITIONS if t["function"]["name"] == "action_enabled"
-        )
+        action_enabled = TOOL_DEFINITIONS_BY_NAME["action_enabled"]
         self.assertIn("action_code", action_enabled["function"]["parameters"]["required"])
         self.assertEqual(
             action_enabled["function"]["parameters"]["properties"]["action_code"]["type"],
@@ -367,7 +292,8 @@ class TestStateQueryMessageFormat(unittest.TestCase):
     def test_state_query_message_format(self):
         """Test state query message format sent to C++"""
         # Start reader with mock stdin
-        mock_stdin = MockStdin()
+        self.executor._raw_objects = True
+        mock_stdin = MockStdin(decoded=True)
         self.executor.start_reader(stdin=mock_stdin)
 
         # Add a response
@@ -423,7 +349,8 @@ class TestStateQueryMessageFormat(unittest.TestCase):
 
     def test_error_handling_invalid_query(self):
         """Test error handling for invalid queries"""
-        mock_stdin = MockStdin()
+        self.executor._raw_objects = True
+        mock_stdin = MockStdin(decoded=True)
         self.executor.start_reader(stdin=mock_stdin)
 
         # Add error response
@@ -448,12 +375,13 @@ class TestStateQueryMessageFormat(unittest.TestCase):
 
     def test_timeout_handling(self):
         """Test timeout handling for state queries"""
-        mock_stdin = MockStdin()
+        self.executor._raw_objects = True
+        mock_stdin = MockStdin(decoded=True)
         # Don't add any response - will timeout
         self.executor.start_reader(stdin=mock_stdin)
 
         # Execute query with short timeout
-        result = self.executor.execute_state_query("get_selection_start_time")
+        result = self.executor.execute_state_query("get_selection_start_time", timeout=0.01)
 
         # Should get timeout error
         self.assertFalse(result.get("success"))
@@ -467,40 +395,50 @@ class TestStateQueryMessageFormat(unittest.TestCase):
 class TestMockedCppResponses(unittest.TestCase):
     """Test state query tools with mocked C++ responses"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.mock_stdout = MockStdout()
-        self.executor = ToolExecutor(stdout=self.mock_stdout)
-        self.state_tools = StateQueryTools(self.executor)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by the stubbed tests"""
+        cls.mock_stdout = MockStdout()
+        cls.executor = ToolExecutor(stdout=cls.mock_stdout)
+        cls.state_tools = StateQueryTools(cls.executor)
+
+    def _stub(self, return_value):
+        """Replace execute_state_query on the shared executor with a Mock"""
+        mock_query = Mock(return_value=return_value)
+        self.executor.execute_state_query = mock_query
+        return mock_query
 
     def test_mocked_successful_response(self):
         """Test state query with mocked successful C++ response"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {
-                "call_id": "call_1",
-                "query_type": "get_selection_start_time",
-                "success": True,
-                "value": 7.5
-            }
-            result = self.state_tools.get_selection_start_time()
-            self.assertEqual(result, 7.5)
+        self._stub({
+            "call_id": "call_1",
+            "query_type": "get_selection_start_time",
+            "success": True,
+            "value": 7.5
+        })
+        result = self.state_tools.get_selection_start_time()
+        self.assertEqual(result, 7.5)
 
     def test_mocked_error_response(self):
         """Test state query with mocked error response"""
-        with patch.object(self.executor, 'execute_state_query') as mock_query:
-            mock_query.return_value = {
-                "call_id": "call_1",
-                "query_type": "get_cursor_position",
-                "success": False,
-                "error": "Playback state not available"
-            }
-            result = self.state_tools.get_cursor_position()
-            self.assertIsNone(result)
+        self._stub({
+            "call_id": "call_1",
+            "query_type": "get_cursor_position",
+            "success": False,
+            "error": "Playback state not available"
+        })
+        result = self.state_tools.get_cursor_position()
+        self.assertIsNone(result)
 
     def test_state_query_execution_flow(self):
         """Test complete state query execution flow"""
-        mock_stdin = MockStdin()
-        self.executor.start_reader(stdin=mock_stdin)
+        # Runs the reader thread, so it needs its own unstubbed executor
+        mock_stdout = MockStdout()
+        executor = ToolExecutor(stdout=mock_stdout)
+        state_tools = StateQueryTools(executor)
+        executor._raw_objects = True
+        mock_stdin = MockStdin(decoded=True)
+        executor.start_reader(stdin=mock_stdin)
 
         # Simulate complete flow: send query, receive response
         mock_stdin.add_response({
@@ -513,15 +451,14 @@ class TestMockedCppResponses(unittest.TestCase):
             }
         })
 
-        result = self.state_tools.has_time_selection()
+        result = state_tools.has_time_selection()
 
         # Verify complete flow
         self.assertTrue(result)
-        self.assertTrue(self.mock_stdout.flush_called)
+        self.assertTrue(mock_stdout.flush_called)
 
-        self.executor.stop_reader()
+        executor.stop_reader()
 
 
 if __name__ == '__main__':
     unittest.main()
-
@@ -12,42 +12,80 @@ NOTE: As of the State Preparation architecture update (2025-12-06),
 the orchestrator uses state_preparation instead of prerequisite_resolver.
 """
 
-import unittest
-import sys
 import os
-import time
+import sys
+import unittest
 from unittest.mock import Mock, MagicMock, patch
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
+import planning_state as planning_state_mod
 from planning_state import PlanningState, PlanningPhase
 from planning_orchestrator import PlanningOrchestrator
 from orchestrator import OrchestratorAgent
-from state_preparation import PreparationResult, PreparationStep
+from state_discovery import StateDiscovery
+from intent_planner import IntentPlanner
+from state_preparation import StatePreparationOrchestrator, PreparationResult, PreparationStep
+
+
+class _FakeClock:
+    """Stands in for the time module inside planning_state"""
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
 
 
 class TestStateSynchronization(unittest.TestCase):
     """Test state synchronization"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared test fixtures (spec introspection runs once)"""
+        cls.tool_registry = Mock()
+        cls.orchestrator_agent = Mock(spec=OrchestratorAgent)
+        # Tests stub the phase methods they drive, so the real phases (and
+        # the intent planner's OpenAI client) are never built
+        cls.orchestrator = PlanningOrchestrator(
+            cls.tool_registry,
+            cls.orchestrator_agent,
+            state_discovery=Mock(spec=StateDiscovery),
+            intent_planner=Mock(spec=IntentPlanner),
+            state_preparation=Mock(spec=StatePreparationOrchestrator)
+        )
+
     def setUp(self):
-        """Set up test fixtures"""
-        self.tool_registry = Mock()
-        self.orchestrator_agent = Mock(spec=OrchestratorAgent)
-        self.orchestrator = PlanningOrchestrator(self.tool_registry, self.orchestrator_agent)
+        """Clear calls and stubbed results left by the previous test"""
+        # Tests that run process_request re-stub discover_state, plan and
+        # prepare themselves, so only the shared mocks need resetting
+        self.tool_registry.reset_mock(return_value=True, side_effect=True)
+        self.orchestrator_agent.reset_mock(return_value=True, side_effect=True)
+
+    def _freeze_clock(self, now=1000.0):
+        """Make planning_state read a fixed time until the test ends"""
+        clock = _FakeClock(now)
+        self.addCleanup(setattr, planning_state_mod, "time", planning_state_mod.time)
+        planning_state_mod.time = clock
+        return clock
 
     def test_state_staleness_detection(self):
         """Test that stale state is detected"""
+        clock = self._freeze_clock()
         planning_state = PlanningState("test message")
         planning_state.set_state_snapshot({"has_time_selection": True})
 
         # Make state stale by setting old timestamp
-        planning_state.state_discovery_timestamp = time.time() - 10.0  # 10 seconds ago
+        planning_state.state_discovery_timestamp = clock.now - 10.0  # 10 seconds ago
 
         self.assertTrue(planning_state.is_state_stale())
 
     def test_fresh_state_not_stale(self):
         """Test that fresh state is not considered stale"""
+        self._freeze_clock()
         planning_state = PlanningState("test message")
         planning_state.set_state_snapshot({"has_time_selection": True})
 
@@ -167,8 +205,9 @@ class TestStateSynchronization(unittest.TestCase):
 
     def test_state_timestamp_updated_on_sync(self):
         """Test that state timestamp is updated after synchronization"""
+        clock = self._freeze_clock()
         planning_state = PlanningState("test message")
-        old_timestamp = time.time() - 10.0
+        old_timestamp = clock.now - 10.0
         planning_state.state_discovery_timestamp = old_timestamp
 
         # Simulate state synchronization
@@ -3,13 +3,15 @@
 Unit tests for state_verification.py
 """
 
-import sys
+import dataclasses
 import os
+import sys
 import unittest
-from unittest.mock import Mock
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from state_verification import (
     StateVerifier,
@@ -18,11 +20,50 @@ from state_verification import (
 )
 
 
+_QUERY_FAILED = {"success": False}
+
+# Expected state after set_time_selection(10.0, 20.0); never mutated by the verifier
+_SET_TIME_SELECTION_EXPECTED = {
+    "has_time_selection": True,
+    "selection_start_time": 10.0,
+    "selection_end_time": 20.0,
+}
+
+# What the verifier returns when a tool has no contract or writes no state
+_NOTHING_TO_VERIFY = VerificationResult(
+    success=True,
+    actual_state={},
+    expected_changes={},
+    discrepancies=[],
+    error=None,
+)
+
+
+class _FakeRegistry:
+    """Stands in for ToolRegistry, answering state queries from a lookup table."""
+
+    def __init__(self):
+        self.answer({})
+
+    def answer(self, values, default=_QUERY_FAILED):
+        """Answer the tools in values successfully and every other tool with default."""
+        self.responses = {tool_name: {"success": True, "value": value} for tool_name, value in values.items()}
+        self.default = default
+
+    def execute_by_name(self, tool_name, args):
+        return self.responses.get(tool_name, self.default)
+
+
+# One fake registry for every class that queries state; setUp clears its table
+_SHARED_REGISTRY = _FakeRegistry()
+
+
 class TestStateVerifierBasics(unittest.TestCase):
     """Test basic StateVerifier functionality."""
 
-    def setUp(self):
-        self.verifier = StateVerifier()
+    @classmethod
+    def setUpClass(cls):
+        cls.verifier = StateVerifier()
 
     def test_unknown_tool_returns_success(self):
         """Unknown tools (no contract) should return success."""
@@ -31,8 +72,7 @@ class TestStateVerifierBasics(unittest.TestCase):
             expected_state={},
             pre_execution_state={}
         )
-        self.assertTrue(result.success)
-        self.assertEqual(len(result.discrepancies), 0)
+        self.assertEqual(result, _NOTHING_TO_VERIFY)
 
     def test_tool_without_state_writes_returns_success(self):
         """Tools without state_writes should return success."""
@@ -41,65 +81,74 @@ class TestStateVerifierBasics(unittest.TestCase):
             expected_state={},
             pre_execution_state={}
         )
-        self.assertTrue(result.success)
+        self.assertEqual(result, _NOTHING_TO_VERIFY)
+
+    def test_result_is_immutable(self):
+        """Verification results are frozen once returned."""
+        result = self.verifier.verify_state_change(
+            tool_name="play",
+            expected_state={},
+            pre_execution_state={}
+        )
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            result.success = False
 
 
 class TestValueMatching(unittest.TestCase):
     """Test value matching logic."""
 
-    def setUp(self):
-        self.verifier = StateVerifier()
-
-    def test_boolean_match(self):
-        """Boolean values should match exactly."""
-        self.assertTrue(self.verifier._values_match("has_time_selection", True, True))
-        self.assertFalse(self.verifier._values_match("has_time_selection", True, False))
-
-    def test_numeric_match_with_tolerance(self):
-        """Numeric values should match within tolerance."""
-        self.assertTrue(self.verifier._values_match("cursor_position", 10.0, 10.005))
-        self.assertTrue(self.verifier._values_match("selection_start_time", 0.0, 0.001))
-        self.assertFalse(self.verifier._values_match("cursor_position", 10.0, 10.02))
-
-    def test_list_match(self):
-        """List values should match (order independent)."""
-        self.assertTrue(self.verifier._values_match("selected_tracks", [1, 2], [2, 1]))
-        self.assertFalse(self.verifier._values_match("selected_tracks", [1, 2], [1, 2, 3]))
-
-    def test_any_marker(self):
-        """'any' marker should match any non-empty value."""
-        self.assertTrue(self.verifier._values_match("selected_tracks", "any", [1, 2]))
-        self.assertFalse(self.verifier._values_match("selected_tracks", "any", []))
-
-
-class TestVerificationWithMockRegistry(unittest.TestCase):
-    """Test verification with mock tool registry."""
+    @classmethod
+    def setUpClass(cls):
+        cls.verifier = StateVerifier()
+
+    # (key, expected, actual, should_match)
+    CASES = (
+        # Boolean values should match exactly
+        ("has_time_selection", True, True, True),
+        ("has_time_selection", True, False, False),
+        # Numeric values should match within tolerance
+        ("cursor_position", 10.0, 10.005, True),
+        ("selection_start_time", 0.0, 0.001, True),
+        ("cursor_position", 10.0, 10.02, False),
+        # List values should match (order independent)
+        ("selected_tracks", [1, 2], [2, 1], True),
+        ("selected_tracks", [1, 2], [1, 2, 3], False),
+        # 'any' marker should match any non-empty value
+        ("selected_tracks", "any", [1, 2], True),
+        ("selected_tracks", "any", [], False),
+    )
+
+    def test_values_match(self):
+        """_values_match should agree with the expected outcome for each case."""
+        for key, expected, actual, should_match in self.CASES:
+            with self.subTest(key=key, expected=expected, actual=actual):
+                self.assertIs(self.verifier._values_match(key, expected, actual), should_match)
+
+
+class TestVerifierWithRegistry(unittest.TestCase):
+    """Test verify_state_change and verify_preparation_step against a fake tool registry."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = _SHARED_REGISTRY
+        cls.verifier = StateVerifier(cls.registry)
 
     def setUp(self):
-        self.mock_registry = Mock()
-        self.verifier = StateVerifier(self.mock_registry)
+        # The registry is shared across the module; drop the previous test's answers
+        self.registry.answer({})
 
     def test_verify_set_time_selection(self):
         """Verify set_time_selection sets selection state correctly."""
-        # Mock the state queries
-        def mock_execute(tool_name, args):
-            if tool_name == "has_time_selection":
-                return {"success": True, "value": True}
-            elif tool_name == "get_selection_start_time":
-                return {"success": True, "value": 10.0}
-            elif tool_name == "get_selection_end_time":
-                return {"success": True, "value": 20.0}
-            return {"success": False}
-
-        self.mock_registry.execute_by_name.side_effect = mock_execute
+        # Answer the state queries
+        self.registry.answer({
+            "has_time_selection": True,
+            "get_selection_start_time": 10.0,
+            "get_selection_end_time": 20.0,
+        })
 
         result = self.verifier.verify_state_change(
             tool_name="set_time_selection",
-            expected_state={
-                "has_time_selection": True,
-                "selection_start_time": 10.0,
-                "selection_end_time": 20.0
-            },
+            expected_state=_SET_TIME_SELECTION_EXPECTED,
             pre_execution_state={}
         )
 
@@ -108,48 +157,29 @@ class TestVerificationWithMockRegistry(unittest.TestCase):
 
     def test_verify_set_time_selection_detects_mismatch(self):
         """Verify detection of state mismatch after set_time_selection."""
-        # Mock the state queries to return wrong values
-        def mock_execute(tool_name, args):
-            if tool_name == "has_time_selection":
-                return {"success": True, "value": False}  # Wrong!
-            return {"success": True, "value": 0.0}
-
-        self.mock_registry.execute_by_name.side_effect = mock_execute
+        # Answer the state queries with wrong values
+        self.registry.answer(
+            {"has_time_selection": False},  # Wrong!
+            default={"success": True, "value": 0.0},
+        )
 
         result = self.verifier.verify_state_change(
             tool_name="set_time_selection",
-            expected_state={
-                "has_time_selection": True,
-                "selection_start_time": 10.0,
-                "selection_end_time": 20.0
-            },
+            expected_state=_SET_TIME_SELECTION_EXPECTED,
             pre_execution_state={}
         )
 
         self.assertFalse(result.success)
         self.assertIn("has_time_selection", result.discrepancies)
 
-
-class TestVerifyPreparationStep(unittest.TestCase):
-    """Test verify_preparation_step method."""
-
-    def setUp(self):
-        self.mock_registry = Mock()
-        self.verifier = StateVerifier(self.mock_registry)
-
     def test_verify_preparation_step_set_time_selection(self):
         """Verify preparation step for set_time_selection."""
-        # Mock successful state queries
-        def mock_execute(tool_name, args):
-            if tool_name == "has_time_selection":
-                return {"success": True, "value": True}
-            elif tool_name == "get_selection_start_time":
-                return {"success": True, "value": 5.0}
-            elif tool_name == "get_selection_end_time":
-                return {"success": True, "value": 15.0}
-            return {"success": False}
-
-        self.mock_registry.execute_by_name.side_effect = mock_execute
+        # Answer the state queries successfully
+        self.registry.answer({
+            "has_time_selection": True,
+            "get_selection_start_time": 5.0,
+            "get_selection_end_time": 15.0,
+        })
 
         result = self.verifier.verify_preparation_step(
             step_tool_name="set_time_selection",
@@ -160,12 +190,9 @@ class TestVerifyPreparationStep(unittest.TestCase):
 
     def test_verify_preparation_step_seek(self):
         """Verify preparation step for seek."""
-        def mock_execute(tool_name, args):
-            if tool_name == "get_cursor_position":
-                return {"success": True, "value": 25.0}
-            return {"success": False}
-
-        self.mock_registry.execute_by_name.side_effect = mock_execute
+        self.registry.answer({
+            "get_cursor_position": 25.0,
+        })
 
         result = self.verifier.verify_preparation_step(
             step_tool_name="seek",
@@ -178,14 +205,19 @@ class TestVerifyPreparationStep(unittest.TestCase):
 class TestGetStateSnapshot(unittest.TestCase):
     """Test get_state_snapshot method."""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = _SHARED_REGISTRY
+        cls.verifier = StateVerifier(cls.registry)
+
     def setUp(self):
-        self.mock_registry = Mock()
-        self.verifier = StateVerifier(self.mock_registry)
+        # The registry is shared across the module; drop the previous test's answers
+        self.registry.answer({})
 
     def test_get_state_snapshot(self):
         """Get full state snapshot."""
-        def mock_execute(tool_name, args):
-            values = {
+        self.registry.answer(
+            {
                 "has_time_selection": True,
                 "get_selection_start_time": 0.0,
                 "get_selection_end_time": 10.0,
@@ -194,16 +226,13 @@ class TestGetStateSnapshot(unittest.TestCase):
                 "get_selected_clips": [],
                 "get_track_list": [1, 2, 3],
                 "get_total_project_time": 120.0,
-            }
-            return {"success": True, "value": values.get(tool_name)}
-
-        self.mock_registry.execute_by_name.side_effect = mock_execute
+            },
+            default={"success": True, "value": None},
+        )
 
         snapshot = self.verifier.get_state_snapshot()
 
-        self.assertIn("has_time_selection", snapshot)
-        self.assertIn("cursor_position", snapshot)
-        self.assertIn("track_list", snapshot)
+        self.assertLessEqual({"has_time_selection", "cursor_position", "track_list"}, snapshot.keys())
 
 
 class TestConvenienceFunction(unittest.TestCase):
@@ -216,8 +245,7 @@ class TestConvenienceFunction(unittest.TestCase):
             expected_state={},
             tool_registry=None
         )
-        self.assertIsInstance(result, VerificationResult)
-        self.assertTrue(result.success)
+        self.assertEqual(result, _NOTHING_TO_VERIFY)
 
 
 if __name__ == "__main__":
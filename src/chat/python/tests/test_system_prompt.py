@@ -15,43 +15,80 @@ documentation, multi-step examples, or detailed planning workflow. The
 State Preparation system handles these automatically.
 """
 
-import unittest
-import sys
 import os
+import sys
+import unittest
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from tool_schemas import FUNCTION_CALLING_SYSTEM_PROMPT
 
 
+# Tokens the prompt must (or must not) contain, checked as one batch per group
+_TIME_PARSING_TOKENS = ("Time Parsing", "20s", "1:30")
+_STATE_QUERY_TOKENS = (
+    "State Query Tools",
+    "has_time_selection",
+    "get_cursor_position",
+    "get_total_project_time",
+)
+# These sections should NOT be in the new simplified prompt
+_VERBOSE_SECTIONS = (
+    "Multi-Step Operation Examples",
+    "Planning Workflow",
+    "Error Handling",
+    "Location Parsing",
+)
+
+
 class TestSystemPrompt(unittest.TestCase):
     """Test simplified system prompt"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Measure and lowercase the prompt and look up the batched tokens once"""
+        cls.prompt_len = len(FUNCTION_CALLING_SYSTEM_PROMPT)
+        cls.prompt_lower = FUNCTION_CALLING_SYSTEM_PROMPT.lower()
+        # Look each batched token up once; a plain substring test also finds
+        # tokens that overlap or are prefixes of one another
+        tokens = _TIME_PARSING_TOKENS + _STATE_QUERY_TOKENS + _VERBOSE_SECTIONS
+        cls.found_tokens = {token for token in tokens if token in FUNCTION_CALLING_SYSTEM_PROMPT}
+
+    def assertPromptContains(self, tokens):
+        """Assert every token is in the prompt, reporting all missing ones at once"""
+        missing = [token for token in tokens if token not in self.found_tokens]
+        self.assertEqual(missing, [], f"System prompt is missing: {missing}")
+
+    def assertPromptLacks(self, tokens):
+        """Assert no token is in the prompt, reporting all present ones at once"""
+        present = [token for token in tokens if token in self.found_tokens]
+        self.assertEqual(present, [], f"System prompt should not contain: {present}")
+
     def test_prompt_is_concise(self):
         """Test that prompt is concise (under 2000 chars for LLM efficiency)"""
         # The simplified prompt should be much smaller than the old verbose one
         self.assertLess(
-            len(FUNCTION_CALLING_SYSTEM_PROMPT),
+            self.prompt_len,
             2500,
-            f"System prompt is too long ({len(FUNCTION_CALLING_SYSTEM_PROMPT)} chars). "
+            f"System prompt is too long ({self.prompt_len} chars). "
             "It should be concise - the State Preparation system handles prerequisites automatically."
         )
 
     def test_includes_core_principle(self):
         """Test that prompt includes the core principle about intent-based commands"""
         self.assertIn("Core Principle", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertIn("backend", FUNCTION_CALLING_SYSTEM_PROMPT.lower())
+        self.assertIn("backend", self.prompt_lower)
         # Should explain that backend handles state automatically
-        self.assertIn("automatically", FUNCTION_CALLING_SYSTEM_PROMPT.lower())
+        self.assertIn("automatically", self.prompt_lower)
 
     def test_includes_time_parsing(self):
         """Test that prompt includes time parsing guidance"""
-        self.assertIn("Time Parsing", FUNCTION_CALLING_SYSTEM_PROMPT)
-        # Should include time format examples
-        self.assertIn("20s", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertIn("1:30", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertIn("first 30 seconds", FUNCTION_CALLING_SYSTEM_PROMPT.lower())
+        # Should include the section and time format examples
+        self.assertPromptContains(_TIME_PARSING_TOKENS)
+        self.assertIn("first 30 seconds", self.prompt_lower)
 
     def test_includes_examples(self):
         """Test that prompt includes simple examples"""
@@ -62,26 +99,18 @@ class TestSystemPrompt(unittest.TestCase):
 
     def test_includes_state_query_tools(self):
         """Test that prompt includes state query tools section"""
-        self.assertIn("State Query Tools", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertIn("has_time_selection", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertIn("get_cursor_position", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertIn("get_total_project_time", FUNCTION_CALLING_SYSTEM_PROMPT)
+        self.assertPromptContains(_STATE_QUERY_TOKENS)
 
     def test_no_verbose_prerequisite_docs(self):
         """Test that prompt does NOT contain verbose prerequisite documentation"""
-        # These sections should NOT be in the new simplified prompt
-        self.assertNotIn("Multi-Step Operation Examples", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertNotIn("Planning Workflow", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertNotIn("Error Handling", FUNCTION_CALLING_SYSTEM_PROMPT)
-        self.assertNotIn("Location Parsing", FUNCTION_CALLING_SYSTEM_PROMPT)
+        self.assertPromptLacks(_VERBOSE_SECTIONS)
 
     def test_explains_backend_handles_prerequisites(self):
         """Test that prompt explains the backend handles prerequisites"""
-        prompt_lower = FUNCTION_CALLING_SYSTEM_PROMPT.lower()
         # Should explain that backend handles state
-        self.assertIn("detect what state is needed", prompt_lower)
-        self.assertIn("infer values", prompt_lower)
-        self.assertIn("set up the required state", prompt_lower)
+        self.assertIn("detect what state is needed", self.prompt_lower)
+        self.assertIn("infer values", self.prompt_lower)
+        self.assertIn("set up the required state", self.prompt_lower)
 
     def test_includes_basic_tool_examples(self):
         """Test that basic tool usage examples are included"""
@@ -91,9 +120,8 @@ class TestSystemPrompt(unittest.TestCase):
 
     def test_mentions_no_worry_about_prerequisites(self):
         """Test that prompt tells LLM not to worry about prerequisites"""
-        prompt_lower = FUNCTION_CALLING_SYSTEM_PROMPT.lower()
-        self.assertIn("don't need to worry", prompt_lower)
-        self.assertIn("prerequisites", prompt_lower)
+        self.assertIn("don't need to worry", self.prompt_lower)
+        self.assertIn("prerequisites", self.prompt_lower)
 
 
 if __name__ == '__main__':
@@ -17,14 +17,38 @@ prerequisite documentation - the State Preparation system handles this
 automatically.
 """
 
-import unittest
-import sys
 import os
+import sys
+import unittest
+
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
+
+from tool_schemas import TOOL_DEFINITIONS_BY_NAME, TOOL_PREREQUISITES
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from tool_schemas import TOOL_DEFINITIONS, TOOL_PREREQUISITES
+# Tool name -> description, flattened once so the description tests do not
+# dig through each definition's nested "function" dict
+_DESCRIPTIONS = {
+    name: tool["function"]["description"] for name, tool in TOOL_DEFINITIONS_BY_NAME.items()
+}
+
+
+# Keys every TOOL_PREREQUISITES entry defines, and the values they may take
+_PREREQUISITE_KEYS = frozenset(
+    ("project_open", "time_selection", "selected_clips", "selected_tracks", "cursor_position")
+)
+_PREREQUISITE_VALUES = frozenset((True, False, None))
+
+
+def _tools_not_requiring(tool_names, prerequisite):
+    """Names of listed tools that exist in TOOL_PREREQUISITES but do not require prerequisite"""
+    return [
+        name for name in tool_names
+        if name in TOOL_PREREQUISITES and not TOOL_PREREQUISITES[name][prerequisite]
+    ]
 
 
 class TestToolPrerequisitesStructure(unittest.TestCase):
@@ -32,32 +56,21 @@ class TestToolPrerequisitesStructure(unittest.TestCase):
 
     def test_all_tools_have_prerequisite_definitions(self):
         """Test all tools in TOOL_DEFINITIONS have prerequisite definitions"""
-        tool_names = [tool["function"]["name"] for tool in TOOL_DEFINITIONS]
-        
-        for tool_name in tool_names:
-            self.assertIn(
-                tool_name, 
-                TOOL_PREREQUISITES,
-                f"Tool '{tool_name}' is in TOOL_DEFINITIONS but missing from TOOL_PREREQUISITES"
-            )
+        missing = sorted(TOOL_DEFINITIONS_BY_NAME.keys() - TOOL_PREREQUISITES.keys())
+        self.assertEqual(
+            missing,
+            [],
+            f"Tools in TOOL_DEFINITIONS but missing from TOOL_PREREQUISITES: {missing}"
+        )
 
     def test_prerequisite_structure_validation(self):
         """Test prerequisite structure is valid for all tools"""
-        required_keys = ["project_open", "time_selection", "selected_clips", "selected_tracks", "cursor_position"]
-        
         for tool_name, prerequisites in TOOL_PREREQUISITES.items():
-            for key in required_keys:
-                self.assertIn(
-                    key,
-                    prerequisites,
-                    f"Tool '{tool_name}' missing prerequisite key '{key}'"
-                )
-                # Value should be True, False, or None
-                self.assertIn(
-                    prerequisites[key],
-                    [True, False, None],
-                    f"Tool '{tool_name}' has invalid value for '{key}': {prerequisites[key]}"
-                )
+            missing = _PREREQUISITE_KEYS - prerequisites.keys()
+            self.assertFalse(missing, f"Tool '{tool_name}' missing prerequisite keys {sorted(missing)}")
+            # Values should be True, False, or None
+            invalid = {prerequisites[key] for key in _PREREQUISITE_KEYS} - _PREREQUISITE_VALUES
+            self.assertFalse(invalid, f"Tool '{tool_name}' has invalid prerequisite values: {invalid}")
 
     def test_required_vs_optional_prerequisites(self):
         """Test that required prerequisites are marked as True"""
@@ -84,12 +97,8 @@ class TestToolPrerequisitesStructure(unittest.TestCase):
             "repeat_last_effect",
         ]
         
-        for tool_name in time_selection_required:
-            if tool_name in TOOL_PREREQUISITES:
-                self.assertTrue(
-                    TOOL_PREREQUISITES[tool_name]["time_selection"],
-                    f"Tool '{tool_name}' should require time_selection but it's not marked as required"
-                )
+        not_required = _tools_not_requiring(time_selection_required, "time_selection")
+        self.assertEqual(not_required, [], f"Tools should require time_selection: {not_required}")
 
     def test_selected_clips_required(self):
         """Test tools that require selected_clips are marked correctly"""
@@ -98,12 +107,8 @@ class TestToolPrerequisitesStructure(unittest.TestCase):
             "duplicate_clip",
         ]
         
-        for tool_name in selected_clips_required:
-            if tool_name in TOOL_PREREQUISITES:
-                self.assertTrue(
-                    TOOL_PREREQUISITES[tool_name]["selected_clips"],
-                    f"Tool '{tool_name}' should require selected_clips but it's not marked as required"
-                )
+        not_required = _tools_not_requiring(selected_clips_required, "selected_clips")
+        self.assertEqual(not_required, [], f"Tools should require selected_clips: {not_required}")
 
     def test_selected_tracks_required(self):
         """Test tools that require selected_tracks are marked correctly"""
@@ -114,22 +119,36 @@ class TestToolPrerequisitesStructure(unittest.TestCase):
             "move_track_to_bottom",
         ]
         
-        for tool_name in selected_tracks_required:
-            if tool_name in TOOL_PREREQUISITES:
-                self.assertTrue(
-                    TOOL_PREREQUISITES[tool_name]["selected_tracks"],
-                    f"Tool '{tool_name}' should require selected_tracks but it's not marked as required"
-                )
+        not_required = _tools_not_requiring(selected_tracks_required, "selected_tracks")
+        self.assertEqual(not_required, [], f"Tools should require selected_tracks: {not_required}")
 
     def test_project_open_always_required(self):
         """Test that project_open is always True (required) for all tools"""
-        for tool_name, prerequisites in TOOL_PREREQUISITES.items():
-            # State query tools might have optional project_open, but most tools require it
-            if not tool_name.startswith("get_") and tool_name != "action_enabled":
-                self.assertTrue(
-                    prerequisites["project_open"],
-                    f"Tool '{tool_name}' should require project_open"
-                )
+        # State query tools might have optional project_open, but most tools require it
+        tool_names = [
+            name for name in TOOL_PREREQUISITES
+            if not name.startswith("get_") and name != "action_enabled"
+        ]
+        not_required = _tools_not_requiring(tool_names, "project_open")
+        self.assertEqual(not_required, [], f"Tools should require project_open: {not_required}")
+
+
+# Prerequisites checked against a state snapshot, in reporting order
+_CHECKED_PREREQUISITES = ("project_open", "time_selection", "selected_clips", "selected_tracks")
+
+
+def _check_prerequisites(tool_name: str, state_snapshot: dict):
+    """Check if prerequisites are met for a tool"""
+    if tool_name not in TOOL_PREREQUISITES:
+        return False, [f"Unknown tool: {tool_name}"]
+
+    prerequisites = TOOL_PREREQUISITES[tool_name]
+    # Only required (True) prerequisites count; False/None are optional or n/a
+    missing = [
+        key for key in _CHECKED_PREREQUISITES
+        if prerequisites[key] is True and not state_snapshot.get(key, False)
+    ]
+    return len(missing) == 0, missing
 
 
 class TestPrerequisiteCheckingLogic(unittest.TestCase):
@@ -137,36 +156,6 @@ class TestPrerequisiteCheckingLogic(unittest.TestCase):
     
     def test_check_prerequisites_all_met(self):
         """Test check_prerequisites() with all prerequisites met"""
-        # Create a helper function to check prerequisites
-        def check_prerequisites(tool_name: str, state_snapshot: dict):
-            """Check if prerequisites are met for a tool"""
-            if tool_name not in TOOL_PREREQUISITES:
-                return False, [f"Unknown tool: {tool_name}"]
-            
-            prerequisites = TOOL_PREREQUISITES[tool_name]
-            missing = []
-            
-            # Check project_open
-            if prerequisites["project_open"] and not state_snapshot.get("project_open", False):
-                missing.append("project_open")
-            
-            # Check time_selection
-            if prerequisites["time_selection"] is True:
-                if not state_snapshot.get("time_selection", False):
-                    missing.append("time_selection")
-            
-            # Check selected_clips
-            if prerequisites["selected_clips"] is True:
-                if not state_snapshot.get("selected_clips", False):
-                    missing.append("selected_clips")
-            
-            # Check selected_tracks
-            if prerequisites["selected_tracks"] is True:
-                if not state_snapshot.get("selected_tracks", False):
-                    missing.append("selected_tracks")
-            
-            return len(missing) == 0, missing
-        
         # Test with all prerequisites met
         state = {
             "project_open": True,
@@ -175,34 +164,12 @@ class TestPrerequisiteCheckingLogic(unittest.TestCase):
             "selected_tracks": True,
         }
         
-        result, missing = check_prerequisites("trim_to_selection", state)
+        result, missing = _check_prerequisites("trim_to_selection", state)
         self.assertTrue(result)
         self.assertEqual(missing, [])
 
     def test_check_prerequisites_missing_required(self):
         """Test check_prerequisites() with missing required prerequisite"""
-        def check_prerequisites(tool_name: str, state_snapshot: dict):
-            """Check if prerequisites are met for a tool"""
-            if tool_name not in TOOL_PREREQUISITES:
-                return False, [f"Unknown tool: {tool_name}"]
-            
-            prerequisites = TOOL_PREREQUISITES[tool_name]
-            missing = []
-            
-            if prerequisites["project_open"] and not state_snapshot.get("project_open", False):
-                missing.append("project_open")
-            if prerequisites["time_selection"] is True:
-                if not state_snapshot.get("time_selection", False):
-                    missing.append("time_selection")
-            if prerequisites["selected_clips"] is True:
-                if not state_snapshot.get("selected_clips", False):
-                    missing.append("selected_clips")
-            if prerequisites["selected_tracks"] is True:
-                if not state_snapshot.get("selected_tracks", False):
-                    missing.append("selected_tracks")
-            
-            return len(missing) == 0, missing
-        
         # Test with missing time_selection
         state = {
             "project_open": True,
@@ -211,28 +178,12 @@ class TestPrerequisiteCheckingLogic(unittest.TestCase):
             "selected_tracks": True,
         }
         
-        result, missing = check_prerequisites("trim_to_selection", state)
+        result, missing = _check_prerequisites("trim_to_selection", state)
         self.assertFalse(result)
         self.assertIn("time_selection", missing)
 
     def test_check_prerequisites_missing_optional(self):
         """Test check_prerequisites() with missing optional prerequisite"""
-        def check_prerequisites(tool_name: str, state_snapshot: dict):
-            """Check if prerequisites are met for a tool"""
-            if tool_name not in TOOL_PREREQUISITES:
-                return False, [f"Unknown tool: {tool_name}"]
-            
-            prerequisites = TOOL_PREREQUISITES[tool_name]
-            missing = []
-            
-            if prerequisites["project_open"] and not state_snapshot.get("project_open", False):
-                missing.append("project_open")
-            if prerequisites["time_selection"] is True:
-                if not state_snapshot.get("time_selection", False):
-                    missing.append("time_selection")
-            
-            return len(missing) == 0, missing
-        
         # Test with optional prerequisite missing (should still pass)
         state = {
             "project_open": True,
@@ -241,27 +192,14 @@ class TestPrerequisiteCheckingLogic(unittest.TestCase):
         
         # split has time_selection as False (optional)
         if "split" in TOOL_PREREQUISITES:
-            result, missing = check_prerequisites("split", state)
+            result, missing = _check_prerequisites("split", state)
             # Should pass because time_selection is optional
             self.assertTrue(result or "split" not in TOOL_PREREQUISITES)
 
     def test_check_prerequisites_invalid_tool_name(self):
         """Test check_prerequisites() with invalid tool name"""
-        def check_prerequisites(tool_name: str, state_snapshot: dict):
-            """Check if prerequisites are met for a tool"""
-            if tool_name not in TOOL_PREREQUISITES:
-                return False, [f"Unknown tool: {tool_name}"]
-            
-            prerequisites = TOOL_PREREQUISITES[tool_name]
-            missing = []
-            
-            if prerequisites["project_open"] and not state_snapshot.get("project_open", False):
-                missing.append("project_open")
-            
-            return len(missing) == 0, missing
-        
         state = {"project_open": True}
-        result, missing = check_prerequisites("nonexistent_tool", state)
+        result, missing = _check_prerequisites("nonexistent_tool", state)
         self.assertFalse(result)
         self.assertIn("Unknown tool", missing[0])
 
@@ -271,103 +209,103 @@ class TestNewToolsFromCatalog(unittest.TestCase):
     
     def test_set_selection_start_time_definition(self):
         """Test set_selection_start_time tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "set_selection_start_time"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("set_selection_start_time")
         self.assertIsNotNone(tool, "set_selection_start_time should be in TOOL_DEFINITIONS")
         self.assertEqual(tool["function"]["parameters"]["required"], ["time"])
         self.assertIn("time", tool["function"]["parameters"]["properties"])
 
     def test_set_selection_end_time_definition(self):
         """Test set_selection_end_time tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "set_selection_end_time"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("set_selection_end_time")
         self.assertIsNotNone(tool, "set_selection_end_time should be in TOOL_DEFINITIONS")
         self.assertEqual(tool["function"]["parameters"]["required"], ["time"])
         self.assertIn("time", tool["function"]["parameters"]["properties"])
 
     def test_reset_selection_definition(self):
         """Test reset_selection tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "reset_selection"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("reset_selection")
         self.assertIsNotNone(tool, "reset_selection should be in TOOL_DEFINITIONS")
         self.assertEqual(tool["function"]["parameters"]["required"], [])
 
     def test_delete_all_tracks_ripple_definition(self):
         """Test delete_all_tracks_ripple tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "delete_all_tracks_ripple"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("delete_all_tracks_ripple")
         self.assertIsNotNone(tool, "delete_all_tracks_ripple should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_cut_all_tracks_ripple_definition(self):
         """Test cut_all_tracks_ripple tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "cut_all_tracks_ripple"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("cut_all_tracks_ripple")
         self.assertIsNotNone(tool, "cut_all_tracks_ripple should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_apply_normalize_loudness_definition(self):
         """Test apply_normalize_loudness tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "apply_normalize_loudness"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("apply_normalize_loudness")
         self.assertIsNotNone(tool, "apply_normalize_loudness should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_apply_compressor_definition(self):
         """Test apply_compressor tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "apply_compressor"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("apply_compressor")
         self.assertIsNotNone(tool, "apply_compressor should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_apply_limiter_definition(self):
         """Test apply_limiter tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "apply_limiter"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("apply_limiter")
         self.assertIsNotNone(tool, "apply_limiter should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_apply_truncate_silence_definition(self):
         """Test apply_truncate_silence tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "apply_truncate_silence"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("apply_truncate_silence")
         self.assertIsNotNone(tool, "apply_truncate_silence should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_repeat_last_effect_definition(self):
         """Test repeat_last_effect tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "repeat_last_effect"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("repeat_last_effect")
         self.assertIsNotNone(tool, "repeat_last_effect should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_seek_definition(self):
         """Test seek tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "seek"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("seek")
         self.assertIsNotNone(tool, "seek should be in TOOL_DEFINITIONS")
         self.assertEqual(tool["function"]["parameters"]["required"], ["time"])
         self.assertIn("time", tool["function"]["parameters"]["properties"])
 
     def test_create_label_track_definition(self):
         """Test create_label_track tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "create_label_track"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("create_label_track")
         self.assertIsNotNone(tool, "create_label_track should be in TOOL_DEFINITIONS")
         self.assertEqual(tool["function"]["parameters"]["required"], [])
 
     def test_add_label_definition(self):
         """Test add_label tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "add_label"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("add_label")
         self.assertIsNotNone(tool, "add_label should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_move_track_to_top_definition(self):
         """Test move_track_to_top tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "move_track_to_top"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("move_track_to_top")
         self.assertIsNotNone(tool, "move_track_to_top should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
 
     def test_move_track_to_bottom_definition(self):
         """Test move_track_to_bottom tool definition"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "move_track_to_bottom"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("move_track_to_bottom")
         self.assertIsNotNone(tool, "move_track_to_bottom should be in TOOL_DEFINITIONS")
         # Description should be concise (prerequisites handled by state_contracts.py)
         self.assertIsNotNone(tool["function"]["description"])
@@ -384,36 +322,34 @@ class TestToolDescriptions(unittest.TestCase):
 
     def test_tools_have_descriptions(self):
         """Test all tools have descriptions"""
-        for tool in TOOL_DEFINITIONS:
-            description = tool["function"]["description"]
+        for name, description in _DESCRIPTIONS.items():
             self.assertIsNotNone(
                 description,
-                f"Tool '{tool['function']['name']}' should have a description"
+                f"Tool '{name}' should have a description"
             )
             self.assertGreater(
                 len(description),
                 10,
-                f"Tool '{tool['function']['name']}' description should be meaningful"
+                f"Tool '{name}' description should be meaningful"
             )
 
     def test_descriptions_are_concise(self):
         """Test descriptions are concise (under 200 chars) for LLM efficiency"""
-        for tool in TOOL_DEFINITIONS:
-            description = tool["function"]["description"]
+        for name, description in _DESCRIPTIONS.items():
             # Descriptions should be concise to reduce token usage
             # (Prerequisites are handled by state_contracts.py, not in descriptions)
             self.assertLess(
                 len(description),
                 300,
-                f"Tool '{tool['function']['name']}' description is too long ({len(description)} chars). "
+                f"Tool '{name}' description is too long ({len(description)} chars). "
                 "Prerequisites should be in state_contracts.py, not the description."
             )
 
     def test_descriptions_explain_what_tool_does(self):
         """Test descriptions explain what the tool does (not how to use it)"""
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "trim_to_selection"), None)
-        if tool:
-            description = tool["function"]["description"].lower()
+        description = _DESCRIPTIONS.get("trim_to_selection")
+        if description:
+            description = description.lower()
             # Should describe the action, not usage instructions
             self.assertTrue(
                 "keep" in description or "trim" in description or "audio" in description,
@@ -427,7 +363,7 @@ class TestPrerequisiteMapping(unittest.TestCase):
     def test_time_selection_prerequisite_maps_to_set_time_selection(self):
         """Test time_selection prerequisite maps to set_time_selection tool"""
         # Verify set_time_selection exists
-        tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == "set_time_selection"), None)
+        tool = TOOL_DEFINITIONS_BY_NAME.get("set_time_selection")
         self.assertIsNotNone(tool, "set_time_selection tool should exist")
         
         # Verify tools that require time_selection can use set_time_selection
@@ -437,24 +373,16 @@ class TestPrerequisiteMapping(unittest.TestCase):
             "apply_normalize",
         ]
         
-        for tool_name in tools_requiring_time_selection:
-            if tool_name in TOOL_PREREQUISITES:
-                self.assertTrue(
-                    TOOL_PREREQUISITES[tool_name]["time_selection"],
-                    f"Tool '{tool_name}' requires time_selection"
-                )
+        not_required = _tools_not_requiring(tools_requiring_time_selection, "time_selection")
+        self.assertEqual(not_required, [], f"Tools should require time_selection: {not_required}")
 
     def test_selected_clips_prerequisite_maps_to_selection_tools(self):
         """Test selected_clips prerequisite maps to appropriate selection tools"""
         # Verify tools that require selected_clips
         tools_requiring_clips = ["join", "duplicate_clip"]
         
-        for tool_name in tools_requiring_clips:
-            if tool_name in TOOL_PREREQUISITES:
-                self.assertTrue(
-                    TOOL_PREREQUISITES[tool_name]["selected_clips"],
-                    f"Tool '{tool_name}' requires selected_clips"
-                )
+        not_required = _tools_not_requiring(tools_requiring_clips, "selected_clips")
+        self.assertEqual(not_required, [], f"Tools should require selected_clips: {not_required}")
 
     def test_selected_tracks_prerequisite_maps_to_selection_tools(self):
         """Test selected_tracks prerequisite maps to appropriate selection tools"""
@@ -466,12 +394,8 @@ class TestPrerequisiteMapping(unittest.TestCase):
             "move_track_to_bottom",
         ]
         
-        for tool_name in tools_requiring_tracks:
-            if tool_name in TOOL_PREREQUISITES:
-                self.assertTrue(
-                    TOOL_PREREQUISITES[tool_name]["selected_tracks"],
-                    f"Tool '{tool_name}' requires selected_tracks"
-                )
+        not_required = _tools_not_requiring(tools_requiring_tracks, "selected_tracks")
+        self.assertEqual(not_required, [], f"Tools should require selected_tracks: {not_required}")
 
     def test_cursor_position_prerequisite_handling(self):
         """Test cursor_position prerequisite handling"""
@@ -495,14 +419,8 @@ class TestIntegration(unittest.TestCase):
     def test_prerequisite_system_with_tool_registry(self):
         """Test prerequisite system works with tool registry structure"""
         # Verify all tools in TOOL_DEFINITIONS have prerequisites
-        tool_names = [tool["function"]["name"] for tool in TOOL_DEFINITIONS]
-        
-        for tool_name in tool_names:
-            self.assertIn(
-                tool_name,
-                TOOL_PREREQUISITES,
-                f"Tool '{tool_name}' needs prerequisite definition"
-            )
+        missing = sorted(TOOL_DEFINITIONS_BY_NAME.keys() - TOOL_PREREQUISITES.keys())
+        self.assertEqual(missing, [], f"Tools need prerequisite definitions: {missing}")
     
     def test_prerequisite_validation_with_state_queries(self):
         """Test prerequisite validation can work with state queries"""
@@ -515,7 +433,7 @@ class TestIntegration(unittest.TestCase):
         
         # Verify these tools exist
         for tool_name in state_query_tools:
-            tool = next((t for t in TOOL_DEFINITIONS if t["function"]["name"] == tool_name), None)
+            tool = TOOL_DEFINITIONS_BY_NAME.get(tool_name)
             self.assertIsNotNone(
                 tool,
                 f"State query tool '{tool_name}' should exist for prerequisite checking"
@@ -524,4 +442,3 @@ class TestIntegration(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
-
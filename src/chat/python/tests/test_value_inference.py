@@ -3,12 +3,14 @@
 Unit tests for value_inference.py
 """
 
-import sys
 import os
+import sys
 import unittest
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports, unless a runner already did
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.insert(0, _parent)
 
 from value_inference import (
     ValueInferenceEngine,
@@ -371,7 +373,7 @@ class TestConvenienceFunction(unittest.TestCase):
             current_state={},
             tool_name="split_at_time"
         )
-        self.assertIsInstance(result, InferenceResult)
+        self.assertIs(type(result), InferenceResult)
         self.assertEqual(result.inferred_values["time"].value, 25.0)
 
 
@@ -623,6 +623,9 @@ TOOL_DEFINITIONS = [
     },
 ]
 
+# Tool definitions indexed by function name, built once at import
+TOOL_DEFINITIONS_BY_NAME = {tool["function"]["name"]: tool for tool in TOOL_DEFINITIONS}
+
 # Tool Prerequisites (DEPRECATED - see state_contracts.py for ground truth)
 # This dictionary is kept for backward compatibility with prerequisite_resolver.py.
 # The new State Preparation system (state_contracts.py, state_gap_analyzer.py,
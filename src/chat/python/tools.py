@@ -35,6 +35,10 @@ class ToolExecutor:
     - other messages -> to message_queue for main loop processing
     """
 
+    # Test hook: when True, the reader takes each item from stdin as an
+    # already-decoded message dict instead of a JSON line
+    _raw_objects = False
+
     def __init__(self, stdout=sys.stdout):
         self.stdout = stdout
         self._pending_calls: Dict[str, tuple] = {}  # call_id -> (event, result)
@@ -79,7 +83,7 @@ class ToolExecutor:
                 break
 
             try:
-                request = json.loads(line.strip())
+                request = line if self._raw_objects else json.loads(line.strip())
                 request_type = request.get("type")
 
                 if request_type == "tool_result":
@@ -202,13 +206,20 @@ class ToolExecutor:
         result = self._wait_for_result(call_id)
         return result
 
-    def execute_state_query(self, query_type: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def execute_state_query(
+        self,
+        query_type: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        *,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Execute a state query and return result.
 
         Args:
             query_type: Type of state query (e.g., "get_selection_start_time")
             parameters: Optional parameters dict
+            timeout: Seconds to wait for the result (default: same as tool calls)
 
         Returns:
             Dict with 'success', 'value' (if successful), 'error' (if failed)
@@ -217,7 +228,10 @@ class ToolExecutor:
             parameters = {}
 
         call_id = self._send_state_query(query_type, parameters)
-        result = self._wait_for_result(call_id)
+        if timeout is None:
+            result = self._wait_for_result(call_id)
+        else:
+            result = self._wait_for_result(call_id, timeout=timeout)
         return result
 
 
@@ -15,6 +15,16 @@ from dataclasses import dataclass
 from state_contracts import StateKey
 from state_gap_analyzer import StateGap
 
+# Time-reference patterns, compiled once at import. _parse_time_references
+# tries them in this order and stops at the first match.
+_MMSS_RE = re.compile(r'(\d+):(\d{2})(?:\s*(?:to|-)\s*(\d+):(\d{2}))?')
+_AT_RE = re.compile(r'at\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?')
+_FIRST_RE = re.compile(r'first\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?')
+_LAST_RE = re.compile(r'last\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?')
+_FROM_TO_RE = re.compile(r'from\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?\s*to\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?')
+_RANGE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?\s*(?:to|-)\s*(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?')
+_SECONDS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)\b')
+
 
 @dataclass
 class InferredValue:
@@ -131,8 +141,7 @@ class ValueInferenceEngine:
         msg_lower = user_message.lower()
 
         # Check for MM:SS format first (more specific)
-        mmss_pattern = r'(\d+):(\d{2})(?:\s*(?:to|-)\s*(\d+):(\d{2}))?'
-        mmss_match = re.search(mmss_pattern, user_message)
+        mmss_match = _MMSS_RE.search(user_message)
         if mmss_match:
             minutes1 = int(mmss_match.group(1))
             seconds1 = int(mmss_match.group(2))
@@ -151,23 +160,20 @@ class ValueInferenceEngine:
                 return result
 
         # Check for "at X seconds" pattern (point time)
-        at_pattern = r'at\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?'
-        at_match = re.search(at_pattern, msg_lower)
+        at_match = _AT_RE.search(msg_lower)
         if at_match:
             result["point_time"] = float(at_match.group(1))
             return result
 
         # Check for "first X seconds" pattern
-        first_pattern = r'first\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?'
-        first_match = re.search(first_pattern, msg_lower)
+        first_match = _FIRST_RE.search(msg_lower)
         if first_match:
             result["start_time"] = 0.0
             result["end_time"] = float(first_match.group(1))
             return result
 
         # Check for "last X seconds" pattern
-        last_pattern = r'last\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?'
-        last_match = re.search(last_pattern, msg_lower)
+        last_match = _LAST_RE.search(msg_lower)
         if last_match:
             duration = float(last_match.group(1))
             total_time = current_state.get("total_project_time", 0)
@@ -178,24 +184,21 @@ class ValueInferenceEngine:
             return result
 
         # Check for "from X to Y" pattern
-        range_pattern = r'from\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?\s*to\s+(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?'
-        range_match = re.search(range_pattern, msg_lower)
+        range_match = _FROM_TO_RE.search(msg_lower)
         if range_match:
             result["start_time"] = float(range_match.group(1))
             result["end_time"] = float(range_match.group(2))
             return result
 
         # Check for "X to Y seconds" pattern
-        range_pattern2 = r'(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?\s*(?:to|-)\s*(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?'
-        range_match2 = re.search(range_pattern2, msg_lower)
+        range_match2 = _RANGE_RE.search(msg_lower)
         if range_match2:
             result["start_time"] = float(range_match2.group(1))
             result["end_time"] = float(range_match2.group(2))
             return result
 
         # Check for standalone "X seconds" or "Xs" (point time)
-        seconds_pattern = r'(\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)\b'
-        seconds_match = re.search(seconds_pattern, msg_lower)
+        seconds_match = _SECONDS_RE.search(msg_lower)
         if seconds_match:
             result["point_time"] = float(seconds_match.group(1))
 